@@ -1,5 +1,5 @@
 """API module initialization."""
 
-from bot.api.server import app, set_bot_instance, run_server
+from bot.api.server import app, create_server, set_bot_instance, run_server
 
-__all__ = ["app", "set_bot_instance", "run_server"]
+__all__ = ["app", "create_server", "set_bot_instance", "run_server"]
@@ -3,24 +3,60 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
 import logging
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Header
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, Depends, Header
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from starlette.datastructures import Headers
+import orjson
 import uvicorn
 
+from bot.brokers.tradingview import TradingViewBroker
+from bot.models import Order, OrderSide, OrderType
+
+try:
+    import uvloop  # noqa: F401
+    import httptools  # noqa: F401
+except ImportError:  # pragma: no cover - uvloop is unavailable on Windows
+    _UVICORN_LOOP = "auto"
+    _UVICORN_HTTP = "auto"
+else:
+    _UVICORN_LOOP = "uvloop"
+    _UVICORN_HTTP = "httptools"
+
 # Will be set by the bot on startup
 _bot_instance = None
+_last_prices: Dict[str, float] = {}
+_has_tradingview_broker = False
+
+# Positions are shared by REST requests and websocket updates for a short
+# window, and concurrent callers share one in-flight broker request.
+POSITIONS_CACHE_TTL = 0.5
+_positions_cache: Dict[str, object] = {"ts": 0.0, "value": None, "inflight": None}
 
 
 def set_bot_instance(bot):
     """Set the bot instance for API access."""
-    global _bot_instance
+    global _bot_instance, _last_prices, _has_tradingview_broker
     _bot_instance = bot
+    # Resolved once here; providers update this mapping in place.
+    _last_prices = getattr(bot.data_provider, "_last_prices", {})
+    # Brokers are ABCs, so isinstance() goes through ABCMeta; check once.
+    _has_tradingview_broker = isinstance(bot.broker, TradingViewBroker)
+    _positions_cache.update(ts=0.0, value=None, inflight=None)
 
 
 def get_bot():
@@ -30,6 +66,30 @@ def get_bot():
     return _bot_instance
 
 
+async def get_positions_cached(bot, ttl: float = POSITIONS_CACHE_TTL):
+    """Return ``bot.broker.get_positions()``, cached for ``ttl`` seconds."""
+    loop = asyncio.get_running_loop()
+    cache = _positions_cache
+    if cache["value"] is not None and loop.time() - cache["ts"] < ttl:
+        return cache["value"]
+
+    task = cache["inflight"]
+    if task is None:
+        task = asyncio.ensure_future(_fetch_positions(bot))
+        cache["inflight"] = task
+    # Shield so one cancelled caller does not cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+async def _fetch_positions(bot):
+    try:
+        positions = await bot.broker.get_positions()
+        _positions_cache.update(ts=asyncio.get_running_loop().time(), value=positions)
+        return positions
+    finally:
+        _positions_cache["inflight"] = None
+
+
 # Pydantic models for API
 class BotStatus(BaseModel):
     running: bool
@@ -84,52 +144,195 @@ class WebhookPayload(BaseModel):
     secret: Optional[str] = None
 
 
+# Datetimes can go into payloads as-is and are formatted by orjson in C; the
+# bot's naive utcnow() values come out exactly as datetime.isoformat() would
+# write them, matching the order timestamps.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _dumps(message) -> str:
+    """Encode a websocket message with orjson."""
+    return orjson.dumps(message, option=_ORJSON_OPTIONS).decode()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Handlers return plain dicts/lists wrapped in this response so FastAPI
+    skips response-model validation and ``jsonable_encoder``; response
+    models on these routes only describe the OpenAPI schema. List endpoints
+    declare theirs through ``responses=`` rather than ``response_model``.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return whether an Accept-Encoding header allows a gzip response.
+
+    An explicit ``gzip`` coding wins over ``*``; either is refused with
+    ``q=0``.
+    """
+    wildcard = False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if name not in ("gzip", "*"):
+            continue
+        accepted = True
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    accepted = float(value) > 0
+                except ValueError:
+                    accepted = False
+        if name == "gzip":
+            return accepted
+        wildcard = accepted
+    return wildcard
+
+
+class _QValueGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves the response alone when gzip is refused.
+
+    Starlette only looks for the substring ``gzip``, so ``gzip;q=0`` would
+    still get a compressed body.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and not _accepts_gzip(
+            Headers(scope=scope).get("accept-encoding", "")
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Run the shared background tasks for the lifetime of the app."""
+    tasks = [
+        asyncio.create_task(_position_broadcaster()),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Trading Bot API",
     description="Real-time trading bot monitoring and control",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
 )
+app.add_middleware(_QValueGZipMiddleware, minimum_size=500)
 
 logger = logging.getLogger(__name__)
 
 # Mount static files
-import os
-from pathlib import Path
-
 ui_dir = Path(__file__).parent.parent / "ui"
 if ui_dir.exists():
     app.mount("/static", StaticFiles(directory=str(ui_dir / "static")), name="static")
 
+# Dashboard HTML is read once at import; set TRADING_BOT_DASHBOARD_RELOAD=1
+# while editing the template to re-read it on every request.
+_DASHBOARD_TEMPLATE = ui_dir / "templates" / "dashboard.html"
+_DASHBOARD_RELOAD = os.getenv("TRADING_BOT_DASHBOARD_RELOAD", "").lower() in {"1", "true", "yes"}
+
+
+def _read_dashboard() -> bytes:
+    if _DASHBOARD_TEMPLATE.exists():
+        return _DASHBOARD_TEMPLATE.read_bytes()
+    return b"<h1>Trading Bot API</h1><p>Dashboard template not found</p>"
+
+
+_DASHBOARD_HTML = _read_dashboard()
+_DASHBOARD_GZIP = gzip.compress(_DASHBOARD_HTML, compresslevel=9)
+
 
 # WebSocket connection manager
+OUTBOUND_QUEUE_SIZE = 256
+
+
 class ConnectionManager:
+    """Tracks websocket clients and owns their outbound message queues.
+
+    Every client gets a bounded queue drained by a single writer task, so
+    broadcasting is a non-blocking enqueue per client instead of one awaited
+    send (or one new task) per message.
+    """
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self._queues[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
+        self.active_connections.add(websocket)
         logger.info("WebSocket client connected (total: %d)", len(self.active_connections))
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self._queues.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None:
+            writer.cancel()
         logger.info("WebSocket client disconnected (total: %d)", len(self.active_connections))
 
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected clients."""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error("Error broadcasting to websocket: %s", e)
-                disconnected.append(connection)
+    async def send(self, websocket: WebSocket, message: dict):
+        """Queue a message for a single client."""
+        self._enqueue(websocket, _dumps(message))
 
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+    async def broadcast(self, message: dict):
+        """Broadcast message to all connected clients.
+
+        The message is encoded once and placed on each client's queue.
+        """
+        if not self.active_connections:
+            return
+
+        payload = _dumps(message)
+        for connection in tuple(self.active_connections):
+            self._enqueue(connection, payload)
+
+    def _enqueue(self, websocket: WebSocket, payload: str) -> None:
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return
+        if queue.full():
+            # Slow client: drop the oldest message rather than grow unbounded
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue) -> None:
+        """Drain a client's queue, merging bursts into a single JSON array."""
+        try:
+            while True:
+                payload = await queue.get()
+                if not queue.empty():
+                    batch = [payload]
+                    while not queue.empty():
+                        batch.append(queue.get_nowait())
+                    payload = "[" + ",".join(batch) + "]"
+                await websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Error sending to websocket: %s", e)
+            self.disconnect(websocket)
 
 
 manager = ConnectionManager()
@@ -138,26 +341,39 @@ manager = ConnectionManager()
 # REST API Endpoints
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the dashboard."""
-    template_path = Path(__file__).parent.parent / "ui" / "templates" / "dashboard.html"
-    if template_path.exists():
-        with open(template_path, 'r') as f:
-            return f.read()
-    return HTMLResponse("<h1>Trading Bot API</h1><p>Dashboard template not found</p>")
+    if _DASHBOARD_RELOAD:
+        return HTMLResponse(content=_read_dashboard())
+    # Serve the copy compressed at startup; GZipMiddleware leaves responses
+    # that already carry a Content-Encoding untouched.
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return HTMLResponse(
+            content=_DASHBOARD_GZIP,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return HTMLResponse(content=_DASHBOARD_HTML, headers={"Vary": "Accept-Encoding"})
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
-async def dashboard():
+async def dashboard(request: Request):
     """Serve the dashboard."""
-    return await root()
+    return await root(request)
 
 
 @app.get("/api/status", response_model=BotStatus)
 async def get_status(bot=Depends(get_bot)):
     """Get bot status."""
     try:
-        uptime = (datetime.utcnow() - bot.start_time).total_seconds() if hasattr(bot, 'start_time') else 0
+        # Monotonic when the runner recorded it: immune to wall-clock steps
+        # and no datetime arithmetic per request
+        start_monotonic = getattr(bot, 'start_monotonic', None)
+        if start_monotonic is not None:
+            uptime = time.monotonic() - start_monotonic
+        elif hasattr(bot, 'start_time'):
+            uptime = (datetime.utcnow() - bot.start_time).total_seconds()
+        else:
+            uptime = 0
         return BotStatus(
             running=getattr(bot, 'is_running', False),
             mode=bot.config.engine.mode,
@@ -170,63 +386,71 @@ async def get_status(bot=Depends(get_bot)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/positions", response_model=List[PositionResponse])
+@app.get(
+    "/api/positions",
+    operation_id="get_positions",
+    summary="List open positions",
+    responses={200: {"model": List[PositionResponse]}},
+)
 async def get_positions(bot=Depends(get_bot)):
     """Get current positions."""
     try:
-        positions = await bot.broker.get_positions()
+        positions = await get_positions_cached(bot)
         result = []
         
         for symbol, pos in positions.items():
-            current_price = bot.data_provider._last_prices.get(symbol, pos.avg_price) if hasattr(bot.data_provider, '_last_prices') else pos.avg_price
+            current_price = _last_prices.get(symbol, pos.avg_price)
             
-            result.append(PositionResponse(
-                symbol=symbol,
-                quantity=pos.quantity,
-                avg_price=pos.avg_price,
-                current_price=current_price,
-                unrealized_pnl=pos.unrealized_pnl(current_price),
-                unrealized_pnl_percent=pos.unrealized_pnl_percent(current_price),
-            ))
+            result.append({
+                "symbol": symbol,
+                "quantity": pos.quantity,
+                "avg_price": pos.avg_price,
+                "current_price": current_price,
+                "unrealized_pnl": pos.unrealized_pnl(current_price),
+                "unrealized_pnl_percent": pos.unrealized_pnl_percent(current_price),
+            })
         
-        return result
+        return ORJSONResponse(result)
     except Exception as e:
         logger.error("Error getting positions: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/orders", response_model=List[OrderResponse])
+@app.get(
+    "/api/orders",
+    operation_id="get_orders",
+    summary="List recent open orders",
+    responses={200: {"model": List[OrderResponse]}},
+)
 async def get_orders(
     status: Optional[str] = None,
     limit: int = 100,
     bot=Depends(get_bot)
 ):
-    """Get recent orders."""
+    """Get recent orders (all of them when ``limit`` is not positive)."""
     try:
-        orders = await bot.broker.get_open_orders()
-        
-        # Filter by status if provided
-        if status:
-            orders = [o for o in orders if o.status.value == status]
-        
-        # Limit results
-        orders = orders[-limit:]
+        # Filter and keep only the newest ``limit`` orders in one pass
+        orders: deque = deque(maxlen=limit if limit > 0 else None)
+        for order in await bot.broker.get_open_orders():
+            if status and order.status.value != status:
+                continue
+            orders.append(order)
         
-        return [
-            OrderResponse(
-                id=order.id,
-                symbol=order.symbol,
-                side=order.side.value,
-                quantity=order.quantity,
-                order_type=order.order_type.value,
-                price=order.price,
-                status=order.status.value,
-                filled_quantity=order.filled_quantity,
-                timestamp=order.timestamp.isoformat(),
-                broker_order_id=order.broker_order_id,
-            )
+        return ORJSONResponse([
+            {
+                "id": order.id,
+                "symbol": order.symbol,
+                "side": order.side.value,
+                "quantity": order.quantity,
+                "order_type": order.order_type.value,
+                "price": order.price,
+                "status": order.status.value,
+                "filled_quantity": order.filled_quantity,
+                "timestamp": order.timestamp.isoformat(),
+                "broker_order_id": order.broker_order_id,
+            }
             for order in orders
-        ]
+        ])
     except Exception as e:
         logger.error("Error getting orders: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -243,15 +467,15 @@ async def get_performance(bot=Depends(get_bot)):
         total_pnl = account.equity - starting_cash
         daily_pnl = total_pnl  # Simplified - could track daily separately
         
-        return PerformanceMetrics(
-            total_pnl=total_pnl,
-            daily_pnl=daily_pnl,
-            win_rate=0.0,  # Would calculate from trade history
-            sharpe_ratio=None,
-            max_drawdown=0.0,  # Would calculate from equity curve
-            total_trades=0,  # Would track in trade history
-            equity=account.equity,
-        )
+        return ORJSONResponse({
+            "total_pnl": total_pnl,
+            "daily_pnl": daily_pnl,
+            "win_rate": 0.0,  # Would calculate from trade history
+            "sharpe_ratio": None,
+            "max_drawdown": 0.0,  # Would calculate from equity curve
+            "total_trades": 0,  # Would track in trade history
+            "equity": account.equity,
+        })
     except Exception as e:
         logger.error("Error getting performance: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -262,14 +486,14 @@ async def get_account(bot=Depends(get_bot)):
     """Get account information."""
     try:
         account = await bot.broker.get_account()
-        return {
+        return ORJSONResponse({
             "account_id": account.account_id,
             "cash": account.cash,
             "buying_power": account.buying_power,
             "equity": account.equity,
             "margin_used": account.margin_used,
             "day_trades_remaining": account.day_trades_remaining,
-        }
+        })
     except Exception as e:
         logger.error("Error getting account: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -277,7 +501,7 @@ async def get_account(bot=Depends(get_bot)):
 
 # Control endpoints
 
-@app.post("/api/start")
+@app.post("/api/start", response_model=None)
 async def start_bot(bot=Depends(get_bot)):
     """Start the trading bot."""
     try:
@@ -289,7 +513,7 @@ async def start_bot(bot=Depends(get_bot)):
         bot.is_running = True
         
         await manager.broadcast({"type": "status", "data": {"running": True}})
-        return {"status": "started"}
+        return ORJSONResponse({"status": "started"})
     except HTTPException:
         raise
     except Exception as e:
@@ -297,7 +521,7 @@ async def start_bot(bot=Depends(get_bot)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/stop")
+@app.post("/api/stop", response_model=None)
 async def stop_bot(bot=Depends(get_bot)):
     """Stop the trading bot."""
     try:
@@ -308,7 +532,7 @@ async def stop_bot(bot=Depends(get_bot)):
         # Bot should check is_running flag in its loop
         
         await manager.broadcast({"type": "status", "data": {"running": False}})
-        return {"status": "stopped"}
+        return ORJSONResponse({"status": "stopped"})
     except HTTPException:
         raise
     except Exception as e:
@@ -316,7 +540,7 @@ async def stop_bot(bot=Depends(get_bot)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/emergency_stop")
+@app.post("/api/emergency_stop", response_model=None)
 async def emergency_stop(bot=Depends(get_bot)):
     """Emergency stop - stop bot and liquidate all positions."""
     try:
@@ -334,9 +558,6 @@ async def emergency_stop(bot=Depends(get_bot)):
                 continue
             
             # Create closing order
-            from bot.models import Order, OrderSide, OrderType
-            import uuid
-            
             side = OrderSide.SELL if position.is_long else OrderSide.BUY_TO_COVER
             order = Order(
                 id=str(uuid.uuid4()),
@@ -354,11 +575,11 @@ async def emergency_stop(bot=Depends(get_bot)):
             "data": {"liquidated_orders": liquidation_orders}
         })
         
-        return {
+        return ORJSONResponse({
             "status": "emergency_stop_executed",
             "liquidated_positions": len(liquidation_orders),
             "order_ids": liquidation_orders,
-        }
+        })
     except Exception as e:
         logger.error("Error in emergency stop: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -366,28 +587,47 @@ async def emergency_stop(bot=Depends(get_bot)):
 
 # TradingView Webhook endpoint
 
-@app.post("/webhook/tradingview")
+@app.post(
+    "/webhook/tradingview",
+    response_model=None,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": WebhookPayload.model_json_schema()}},
+        }
+    },
+)
 async def tradingview_webhook(
-    payload: WebhookPayload,
+    request: Request,
     x_signature: Optional[str] = Header(None),
     bot=Depends(get_bot)
 ):
     """Receive TradingView webhook alerts."""
+    # Parse the raw body in a single pass instead of letting FastAPI decode
+    # JSON into a dict and then validate that dict into the model.
+    body = await request.body()
+    try:
+        payload = WebhookPayload.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
     try:
         # Check if bot has TradingView broker
-        from bot.brokers.tradingview import TradingViewBroker
-        
-        if not isinstance(bot.broker, TradingViewBroker):
+        if not _has_tradingview_broker:
             raise HTTPException(
                 status_code=400,
                 detail="Bot is not configured with TradingView broker"
             )
         
-        # Process webhook
-        order = await bot.broker.process_webhook(payload.dict(), x_signature)
+        # Process webhook; unsent optional fields stay absent (a null
+        # "secret" would fail the secret check), and the signature covers
+        # the raw body since the dump coerces numbers
+        order = await bot.broker.process_webhook(
+            payload.model_dump(exclude_none=True), x_signature, body
+        )
         
         if order is None:
-            return {"status": "skipped", "reason": "duplicate_signal"}
+            return ORJSONResponse({"status": "skipped", "reason": "duplicate_signal"})
         
         # Broadcast to WebSocket clients
         await manager.broadcast({
@@ -400,11 +640,11 @@ async def tradingview_webhook(
             }
         })
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "order_id": order.broker_order_id,
             "symbol": order.symbol,
-        }
+        })
         
     except Exception as e:
         logger.error("Error processing TradingView webhook: %s", e, exc_info=True)
@@ -413,48 +653,56 @@ async def tradingview_webhook(
 
 # WebSocket endpoint for real-time updates
 
+POSITION_UPDATE_INTERVAL = 2.0
+
+
+async def _position_broadcaster():
+    """Poll positions once per interval and broadcast them to every client."""
+    while True:
+        await asyncio.sleep(POSITION_UPDATE_INTERVAL)
+        if _bot_instance is None or not manager.active_connections:
+            continue
+
+        try:
+            positions = await get_positions_cached(_bot_instance)
+            position_data = []
+
+            for symbol, pos in positions.items():
+                current_price = _last_prices.get(symbol, pos.avg_price)
+                position_data.append({
+                    "symbol": symbol,
+                    "quantity": pos.quantity,
+                    "pnl": pos.unrealized_pnl(current_price),
+                })
+
+            await manager.broadcast({
+                "type": "position_update",
+                "data": position_data,
+                "timestamp": datetime.utcnow(),
+            })
+        except Exception as e:
+            logger.error("Error in position broadcaster: %s", e)
+            await asyncio.sleep(5)
+
+
 @app.websocket("/ws/updates")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time bot updates."""
     await manager.connect(websocket)
     
     try:
-        bot = get_bot()
+        get_bot()
         
         # Send initial state
-        await websocket.send_json({
+        await manager.send(websocket, {
             "type": "connected",
             "data": {"message": "Connected to trading bot"}
         })
         
-        # Keep connection alive and send periodic updates
+        # Position updates come from the shared broadcaster task; this
+        # handler only waits for the client to go away.
         while True:
-            try:
-                # Send position updates every 2 seconds
-                await asyncio.sleep(2)
-                
-                positions = await bot.broker.get_positions()
-                position_data = []
-                
-                for symbol, pos in positions.items():
-                    current_price = bot.data_provider._last_prices.get(symbol, pos.avg_price) if hasattr(bot.data_provider, '_last_prices') else pos.avg_price
-                    position_data.append({
-                        "symbol": symbol,
-                        "quantity": pos.quantity,
-                        "pnl": pos.unrealized_pnl(current_price),
-                    })
-                
-                await websocket.send_json({
-                    "type": "position_update",
-                    "data": position_data,
-                    "timestamp": datetime.utcnow().isoformat(),
-                })
-                
-            except WebSocketDisconnect:
-                break
-            except Exception as e:
-                logger.error("Error in websocket update loop: %s", e)
-                await asyncio.sleep(5)
+            await websocket.receive_text()
                 
     except WebSocketDisconnect:
         pass
@@ -464,12 +712,32 @@ async def websocket_endpoint(websocket: WebSocket):
 
 # Health check endpoint
 
-@app.get("/health")
+@app.get("/health", response_model=None)
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return ORJSONResponse({"status": "healthy", "timestamp": datetime.utcnow()})
+
+
+def create_server(host: str = "0.0.0.0", port: int = 8000) -> uvicorn.Server:
+    """Build the API server (httptools when installed) without starting it.
+
+    ``await server.serve()`` runs it on the caller's event loop, alongside the
+    engine; set ``server.should_exit`` to stop it.
+    """
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        loop=_UVICORN_LOOP,
+        http=_UVICORN_HTTP,
+        # Broadcasts are encoded once and fanned out; per-message deflate
+        # would recompress the same payload separately for every client.
+        ws_per_message_deflate=False,
+        log_level="info",
+    )
+    return uvicorn.Server(config)
 
 
 def run_server(host: str = "0.0.0.0", port: int = 8000):
-    """Run the FastAPI server."""
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    """Run the FastAPI server (uvloop + httptools when installed)."""
+    create_server(host, port).run()
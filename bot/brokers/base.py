@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import abc
+from collections import defaultdict
 from typing import Dict, Iterable, List, Optional
 
 from bot.models import Account, Order, Position
@@ -124,12 +125,17 @@ class OrderManager:
     def __init__(self):
         self._orders: Dict[str, Order] = {}
         self._broker_id_map: Dict[str, str] = {}
+        # Insertion-ordered indices of non-terminal orders (dicts used as
+        # ordered sets) so open-order queries scale with open orders only.
+        self._open_ids: Dict[str, None] = {}
+        self._open_by_symbol: Dict[str, Dict[str, None]] = defaultdict(dict)
 
     def add_order(self, order: Order) -> None:
         """Register a new order."""
         self._orders[order.id] = order
         if order.broker_order_id:
             self._broker_id_map[order.broker_order_id] = order.id
+        self._index(order)
 
     def update_order(self, order: Order) -> None:
         """Update existing order state."""
@@ -137,6 +143,7 @@ class OrderManager:
             self._orders[order.id] = order
             if order.broker_order_id:
                 self._broker_id_map[order.broker_order_id] = order.id
+            self._index(order)
 
     def get_order(self, order_id: str) -> Optional[Order]:
         """Get order by internal ID or broker ID."""
@@ -147,15 +154,12 @@ class OrderManager:
 
     def get_open_orders(self) -> List[Order]:
         """Get all non-terminal orders."""
-        return [order for order in self._orders.values() if not order.is_complete]
+        return self._collect_open(self._open_ids)
 
     def get_pending_orders_for_symbol(self, symbol: str) -> List[Order]:
         """Get all pending orders for a specific symbol."""
-        return [
-            order
-            for order in self._orders.values()
-            if order.symbol == symbol and not order.is_complete
-        ]
+        ids = self._open_by_symbol.get(symbol)
+        return self._collect_open(ids) if ids else []
 
     def remove_order(self, order_id: str) -> None:
         """Remove an order from tracking."""
@@ -164,3 +168,31 @@ class OrderManager:
             self._orders.pop(order.id, None)
             if order.broker_order_id:
                 self._broker_id_map.pop(order.broker_order_id, None)
+            self._unindex(order)
+
+    def _collect_open(self, ids: Dict[str, None]) -> List[Order]:
+        open_orders = []
+        for order_id in list(ids):
+            order = self._orders[order_id]
+            # Brokers may move an order to a terminal state in place without
+            # calling update_order(); drop such orders from the index lazily.
+            if order.is_complete:
+                self._unindex(order)
+            else:
+                open_orders.append(order)
+        return open_orders
+
+    def _index(self, order: Order) -> None:
+        if order.is_complete:
+            self._unindex(order)
+        else:
+            self._open_ids[order.id] = None
+            self._open_by_symbol[order.symbol][order.id] = None
+
+    def _unindex(self, order: Order) -> None:
+        self._open_ids.pop(order.id, None)
+        symbol_ids = self._open_by_symbol.get(order.symbol)
+        if symbol_ids is not None:
+            symbol_ids.pop(order.id, None)
+            if not symbol_ids:
+                del self._open_by_symbol[order.symbol]
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
 
 from bot.brokers.base import (
     BaseBroker,
@@ -25,6 +27,9 @@ from bot.models import (
     Position,
 )
 
+# Sides that spend cash and add (signed) quantity
+_BUY_SIDES = frozenset((OrderSide.BUY, OrderSide.BUY_TO_COVER))
+
 
 class PaperBroker(BaseBroker):
     """Enhanced paper trading broker with realistic simulation."""
@@ -36,24 +41,43 @@ class PaperBroker(BaseBroker):
         commission_percent: float = 0.0,
         slippage_percent: float = 0.0,
         simulate_partial_fills: bool = False,
+        simulate_latency: bool = True,
+        clock: Callable[[], datetime] = datetime.utcnow,
     ) -> None:
         self._starting_cash = starting_cash
         self._cash = starting_cash
+        # Cost of accepted orders still waiting on their fill; concurrent
+        # submissions check funds against cash net of it
+        self._reserved_cash = 0.0
         self._commission_per_share = commission_per_share
         self._commission_percent = commission_percent
         self._slippage_percent = slippage_percent
         self._simulate_partial_fills = simulate_partial_fills
+        # Connection/fill delays; backtests replay bars and turn them off
+        self._simulate_latency = simulate_latency
+        # Source of fill/account timestamps; injectable for deterministic runs
+        self._clock = clock
 
         self._positions: Dict[str, Position] = {}
+        # Read-only open-positions view handed out by get_positions, rebuilt
+        # only after a fill changes the book
+        self._open_positions: Optional[Mapping[str, Position]] = None
         self._last_prices: Dict[str, float] = {}
         self._connected = False
         self._order_manager = OrderManager()
         self._logger = logging.getLogger(self.__class__.__name__)
-        self._account_id = f"paper_{uuid.uuid4().hex[:8]}"
+        account_key = uuid.uuid4().hex[:8]
+        self._account_id = f"paper_{account_key}"
+        # Fill ids only need to be unique within this simulated account; order
+        # ids carry the account key so they stay distinct across runs
+        self._fill_sequence = itertools.count(1)
+        self._order_id_prefix = f"PAPER_{account_key.upper()}_"
+        self._order_sequence = itertools.count(1)
 
     async def connect(self) -> None:
         """Establish connection (instant for paper broker)."""
-        await asyncio.sleep(0.1)
+        if self._simulate_latency:
+            await asyncio.sleep(0.1)
         self._connected = True
         self._logger.info("Paper broker connected (account: %s)", self._account_id)
 
@@ -67,10 +91,13 @@ class PaperBroker(BaseBroker):
         if not self._connected:
             raise ConnectionError("Broker not connected")
 
+        # One price lookup per position; unpriced positions are left out
         equity = self._cash
+        last_prices = self._last_prices
         for symbol, position in self._positions.items():
-            if symbol in self._last_prices:
-                equity += position.quantity * self._last_prices[symbol]
+            price = last_prices.get(symbol)
+            if price is not None:
+                equity += position.quantity * price
 
         return Account(
             account_id=self._account_id,
@@ -78,18 +105,30 @@ class PaperBroker(BaseBroker):
             buying_power=self._cash,
             equity=equity,
             margin_used=0.0,
-            timestamp=datetime.utcnow(),
+            timestamp=self._clock(),
         )
 
     async def get_balance(self) -> float:
         """Return current cash balance."""
         return self._cash
 
-    async def get_positions(self) -> Dict[str, Position]:
-        """Return all open positions."""
-        return {
-            symbol: pos for symbol, pos in self._positions.items() if not pos.is_flat
-        }
+    async def get_positions(self) -> Mapping[str, Position]:
+        """Return all open positions.
+
+        The same read-only mapping is returned until the next fill, so callers
+        polling every bar (the engine, the API) share it; PortfolioState keys
+        its exposure cache on that identity.
+        """
+        open_positions = self._open_positions
+        if open_positions is None:
+            open_positions = self._open_positions = MappingProxyType(
+                {
+                    symbol: pos
+                    for symbol, pos in self._positions.items()
+                    if not pos.is_flat
+                }
+            )
+        return open_positions
 
     async def get_position(self, symbol: str) -> Optional[Position]:
         """Get position for specific symbol."""
@@ -101,7 +140,8 @@ class PaperBroker(BaseBroker):
         if not self._connected:
             raise ConnectionError("Broker is not connected")
 
-        order.broker_order_id = f"PAPER_{uuid.uuid4().hex[:12].upper()}"
+        sequence = next(self._order_sequence)
+        order.broker_order_id = f"{self._order_id_prefix}{sequence:08X}"
         order.status = OrderStatus.SUBMITTED
         self._order_manager.add_order(order)
 
@@ -113,22 +153,30 @@ class PaperBroker(BaseBroker):
             raise OrderRejectedError(order.error_message, order)
 
         cost = self._calculate_order_cost(order, fill_price)
-        if self._cash < cost:
+        available = self._cash - self._reserved_cash
+        if available < cost:
             order.status = OrderStatus.REJECTED
             order.error_message = (
-                f"Insufficient funds: need ${cost:.2f}, have ${self._cash:.2f}"
+                f"Insufficient funds: need ${cost:.2f}, have ${available:.2f}"
             )
             self._logger.warning("Order rejected: %s", order.error_message)
             raise InsufficientFundsError(order.error_message)
 
         order.status = OrderStatus.ACCEPTED
 
-        await asyncio.sleep(0.05)
+        # Hold the cost across the awaits below so orders submitted meanwhile
+        # cannot spend the same cash
+        self._reserved_cash += cost
+        try:
+            if self._simulate_latency:
+                await asyncio.sleep(0.05)
 
-        if self._simulate_partial_fills and order.quantity > 100:
-            await self._execute_partial_fills(order, fill_price)
-        else:
-            await self._execute_full_fill(order, fill_price)
+            if self._simulate_partial_fills and order.quantity > 100:
+                await self._execute_partial_fills(order, fill_price)
+            else:
+                await self._execute_full_fill(order, fill_price)
+        finally:
+            self._reserved_cash -= cost
 
         self._logger.info(
             "Order %s filled: %s %s %.2f @ %.2f",
@@ -163,7 +211,9 @@ class PaperBroker(BaseBroker):
         """Get all open orders."""
         return self._order_manager.get_open_orders()
 
-    async def reconcile_positions(self, symbols: Iterable[str]) -> Dict[str, Position]:
+    async def reconcile_positions(
+        self, symbols: Iterable[str]
+    ) -> Mapping[str, Position]:
         """Reconcile positions (for paper trading, just return current state)."""
         return await self.get_positions()
 
@@ -182,7 +232,7 @@ class PaperBroker(BaseBroker):
             return None
 
         slippage = base_price * self._slippage_percent
-        if order.side in {OrderSide.BUY, OrderSide.BUY_TO_COVER}:
+        if order.side in _BUY_SIDES:
             return base_price + slippage
         else:
             return max(0.01, base_price - slippage)
@@ -195,7 +245,7 @@ class PaperBroker(BaseBroker):
             + notional * self._commission_percent
         )
 
-        if order.side in {OrderSide.BUY, OrderSide.BUY_TO_COVER}:
+        if order.side in _BUY_SIDES:
             return notional + commission
         else:
             return commission
@@ -208,8 +258,8 @@ class PaperBroker(BaseBroker):
         )
 
         fill = OrderFill(
-            fill_id=f"FILL_{uuid.uuid4().hex[:8].upper()}",
-            timestamp=datetime.utcnow(),
+            fill_id=f"FILL_{next(self._fill_sequence):08X}",
+            timestamp=self._clock(),
             quantity=order.quantity,
             price=fill_price,
             commission=commission,
@@ -223,6 +273,8 @@ class PaperBroker(BaseBroker):
         """Simulate partial fills (multiple executions)."""
         remaining = order.quantity
         num_fills = min(3, int(order.quantity / 50) + 1)
+        # Without simulated latency the slices land together: one clock read
+        timestamp = None if self._simulate_latency else self._clock()
 
         for i in range(num_fills):
             fill_qty = remaining / (num_fills - i)
@@ -236,8 +288,8 @@ class PaperBroker(BaseBroker):
             )
 
             fill = OrderFill(
-                fill_id=f"FILL_{uuid.uuid4().hex[:8].upper()}",
-                timestamp=datetime.utcnow(),
+                fill_id=f"FILL_{next(self._fill_sequence):08X}",
+                timestamp=timestamp or self._clock(),
                 quantity=fill_qty,
                 price=actual_price,
                 commission=commission,
@@ -247,7 +299,8 @@ class PaperBroker(BaseBroker):
             self._update_position(order, fill)
             remaining -= fill_qty
 
-            await asyncio.sleep(0.02)
+            if self._simulate_latency:
+                await asyncio.sleep(0.02)
 
         self._order_manager.update_order(order)
 
@@ -256,7 +309,7 @@ class PaperBroker(BaseBroker):
         symbol = order.symbol
         signed_qty = (
             fill.quantity
-            if order.side in {OrderSide.BUY, OrderSide.BUY_TO_COVER}
+            if order.side in _BUY_SIDES
             else -fill.quantity
         )
 
@@ -266,6 +319,7 @@ class PaperBroker(BaseBroker):
             self._positions[symbol] = position
 
         position.update(signed_qty, fill.price)
+        self._open_positions = None
 
         cost = signed_qty * fill.price + fill.commission
         self._cash -= cost
@@ -274,28 +328,43 @@ class PaperBroker(BaseBroker):
             self._positions.pop(symbol, None)
 
     async def liquidate_all_positions(self) -> List[Order]:
-        """Emergency liquidation of all positions."""
-        orders = []
-        for symbol, position in list(self._positions.items()):
-            if position.is_flat:
-                continue
-
-            side = OrderSide.SELL if position.is_long else OrderSide.BUY_TO_COVER
-            order = Order(
+        """Emergency liquidation of all positions.
+
+        Closing orders are built from a snapshot of the open book. Long
+        positions are sold first so their proceeds fund the buy-to-covers;
+        each batch is submitted concurrently, so the simulated latency is paid
+        once per side rather than per position. Failures are logged and left
+        out of the result.
+        """
+        orders = [
+            Order(
                 id=str(uuid.uuid4()),
                 symbol=symbol,
-                side=side,
+                side=OrderSide.SELL if position.is_long else OrderSide.BUY_TO_COVER,
                 quantity=abs(position.quantity),
                 order_type=OrderType.MARKET,
             )
+            for symbol, position in self._positions.items()
+            if not position.is_flat
+        ]
+        sells = [order for order in orders if order.side is OrderSide.SELL]
+        covers = [order for order in orders if order.side is OrderSide.BUY_TO_COVER]
 
-            try:
-                filled_order = await self.submit_order(order)
-                orders.append(filled_order)
-            except Exception as e:
-                self._logger.error("Failed to liquidate %s: %s", symbol, e)
-
-        return orders
+        filled = []
+        for batch in (sells, covers):
+            if not batch:
+                continue
+            results = await asyncio.gather(
+                *(self.submit_order(order) for order in batch), return_exceptions=True
+            )
+            for order, result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    self._logger.error(
+                        "Failed to liquidate %s: %s", order.symbol, result
+                    )
+                else:
+                    filled.append(result)
+        return filled
 
     def get_trade_history(self) -> List[Order]:
         """Get all filled orders."""
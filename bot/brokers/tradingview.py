@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import hmac
 import logging
-import uuid
+import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
 
 from bot.brokers.base import BaseBroker, BrokerError, OrderRejectedError
 from bot.models import (
@@ -22,12 +25,40 @@ from bot.models import (
     SignalAction,
 )
 
+# TradingView alert action -> internal signal action (keys are lower-case)
+_ACTION_MAP: Dict[str, SignalAction] = {
+    "buy": SignalAction.OPEN_LONG,
+    "sell": SignalAction.CLOSE_LONG,
+    "short": SignalAction.OPEN_SHORT,
+    "cover": SignalAction.CLOSE_SHORT,
+    "buy_to_cover": SignalAction.CLOSE_SHORT,
+    "sell_short": SignalAction.OPEN_SHORT,
+}
+
+# Signal actions that map to buy-side orders, and the buy-side order sides
+_BUY_ACTIONS = frozenset((SignalAction.OPEN_LONG, SignalAction.CLOSE_SHORT))
+_BUY_SIDES = frozenset((OrderSide.BUY, OrderSide.BUY_TO_COVER))
+
 
 class TradingViewWebhookPayload:
     """Parsed TradingView webhook payload."""
 
+    __slots__ = (
+        "timestamp",
+        "ticker",
+        "action",
+        "price",
+        "quantity",
+        "strategy",
+        "message",
+        "secret",
+    )
+
     def __init__(self, data: dict):
-        self.timestamp = data.get("timestamp", datetime.utcnow().isoformat())
+        # Alerts without a timestamp are stamped on receipt; keep the datetime
+        # rather than round-tripping it through isoformat()/fromisoformat()
+        timestamp = data.get("timestamp")
+        self.timestamp = datetime.utcnow() if timestamp is None else timestamp
         self.ticker = data.get("ticker", "")
         self.action = data.get("action", "")
         self.price = float(data.get("price", 0))
@@ -38,16 +69,10 @@ class TradingViewWebhookPayload:
 
     def to_signal(self) -> Signal:
         """Convert webhook payload to internal Signal."""
-        action_map = {
-            "buy": SignalAction.OPEN_LONG,
-            "sell": SignalAction.CLOSE_LONG,
-            "short": SignalAction.OPEN_SHORT,
-            "cover": SignalAction.CLOSE_SHORT,
-            "buy_to_cover": SignalAction.CLOSE_SHORT,
-            "sell_short": SignalAction.OPEN_SHORT,
-        }
-
-        action = action_map.get(self.action.lower(), SignalAction.OPEN_LONG)
+        action = _ACTION_MAP.get(self.action.lower(), SignalAction.OPEN_LONG)
+        timestamp = self.timestamp
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
 
         return Signal(
             symbol=self.ticker,
@@ -60,9 +85,7 @@ class TradingViewWebhookPayload:
                 "message": self.message,
                 "price": self.price,
             },
-            timestamp=datetime.fromisoformat(self.timestamp)
-            if isinstance(self.timestamp, str)
-            else self.timestamp,
+            timestamp=timestamp,
         )
 
 
@@ -74,12 +97,16 @@ class TradingViewBroker(BaseBroker):
     and delegates actual execution to another broker (paper, thinkorswim, etc.).
     """
 
+    REQUIRED_FIELDS = frozenset(("ticker", "action", "quantity"))
+
     def __init__(
         self,
         execution_broker: BaseBroker,
         webhook_secret: str,
         order_type: OrderType = OrderType.MARKET,
         limit_offset_percent: float = 0.1,
+        webhook_concurrency: int = 8,
+        reconcile_concurrency: int = 8,
     ):
         """
         Initialize TradingView webhook broker.
@@ -89,16 +116,29 @@ class TradingViewBroker(BaseBroker):
             webhook_secret: Secret key for webhook validation
             order_type: Default order type (MARKET or LIMIT)
             limit_offset_percent: If using LIMIT orders, offset from market price
+            webhook_concurrency: Max webhook orders in flight to the execution broker
+            reconcile_concurrency: Max per-symbol position lookups in flight
         """
+        if webhook_concurrency < 1:
+            raise ValueError("webhook_concurrency must be at least 1")
+        if reconcile_concurrency < 1:
+            raise ValueError("reconcile_concurrency must be at least 1")
+
         self.execution_broker = execution_broker
         self.webhook_secret = webhook_secret
+        self._webhook_secret_bytes = webhook_secret.encode()
         self.order_type = order_type
         self.limit_offset_percent = limit_offset_percent
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._submit_semaphore = asyncio.Semaphore(webhook_concurrency)
+        self._reconcile_semaphore = asyncio.Semaphore(reconcile_concurrency)
         
-        # Track webhook signal deduplication
-        self._seen_signals: Dict[str, datetime] = {}
+        # Track webhook signal deduplication: bounded map of
+        # (symbol, action, quantity, timestamp) -> time.monotonic() first-seen
+        # time, oldest entries first
+        self._seen_signals: OrderedDict[Tuple[Any, ...], float] = OrderedDict()
         self._signal_ttl_seconds = 60
+        self._max_seen_signals = 10_000
 
     async def connect(self) -> None:
         """Connect the execution broker."""
@@ -126,77 +166,105 @@ class TradingViewBroker(BaseBroker):
         """Delegate to execution broker."""
         return await self.execution_broker.get_position(symbol)
 
-    def validate_webhook(self, payload: dict, signature: Optional[str] = None) -> bool:
+    def validate_webhook(
+        self,
+        payload: dict,
+        signature: Optional[str] = None,
+        body: Optional[bytes] = None,
+    ) -> bool:
         """
         Validate incoming webhook payload.
         
         Args:
             payload: The webhook payload dict
             signature: Optional HMAC signature for verification
+            body: Raw request body the signature was computed over; when
+                omitted, the payload's compact key-sorted JSON is signed
             
         Returns:
             True if webhook is valid
         """
         # Check required fields
-        required_fields = ["ticker", "action", "quantity"]
-        if not all(field in payload for field in required_fields):
+        if not self.REQUIRED_FIELDS.issubset(payload):
             self.logger.warning("Webhook missing required fields: %s", payload)
             return False
 
-        # Verify secret if provided in payload
+        # Verify secret if provided in payload; compared in constant time like
+        # the signature below so response timing can't leak the secret
         if "secret" in payload:
-            if payload["secret"] != self.webhook_secret:
+            provided = payload["secret"]
+            if not (
+                isinstance(provided, str)
+                and hmac.compare_digest(provided.encode(), self._webhook_secret_bytes)
+            ):
                 self.logger.warning("Webhook secret mismatch")
                 return False
 
-        # Verify HMAC signature if provided
-        if signature:
-            payload_str = str(sorted(payload.items()))
-            expected_sig = hmac.new(
-                self.webhook_secret.encode(), payload_str.encode(), hashlib.sha256
-            ).hexdigest()
-            if not hmac.compare_digest(signature, expected_sig):
-                self.logger.warning("Webhook HMAC signature invalid")
-                return False
+        # Unsigned webhooks (secret-in-payload only) never build the
+        # canonical message
+        if not signature:
+            return True
+
+        # Verify HMAC signature over the bytes the client sent; in-process
+        # callers without a body sign compact, key-sorted JSON instead
+        if body is None:
+            body = orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS)
+        expected_sig = hmac.digest(self._webhook_secret_bytes, body, "sha256").hex()
+        # As bytes: compare_digest rejects non-ASCII str with a TypeError
+        if not hmac.compare_digest(signature.encode(), expected_sig.encode()):
+            self.logger.warning("Webhook HMAC signature invalid")
+            return False
 
         return True
 
     def is_duplicate_signal(self, signal: Signal) -> bool:
         """Check if this signal was recently processed (prevent duplicates)."""
-        # Create unique signal fingerprint
-        fingerprint = f"{signal.symbol}:{signal.action.value}:{signal.quantity}:{signal.timestamp.isoformat()}"
-        signal_hash = hashlib.md5(fingerprint.encode()).hexdigest()
-
-        # Clean up old signals
-        now = datetime.utcnow()
-        self._seen_signals = {
-            k: v
-            for k, v in self._seen_signals.items()
-            if (now - v).total_seconds() < self._signal_ttl_seconds
-        }
+        # Dedup is in-process only, so the native fields themselves are the key
+        fingerprint = (signal.symbol, signal.action, signal.quantity, signal.timestamp)
+
+        # Expire old signals from the front; entries stay in first-seen order
+        # so both TTL expiry and capacity eviction pop from the left
+        now = time.monotonic()
+        seen = self._seen_signals
+        while seen and now - next(iter(seen.values())) >= self._signal_ttl_seconds:
+            seen.popitem(last=False)
 
         # Check if seen
-        if signal_hash in self._seen_signals:
-            self.logger.info("Duplicate signal detected, skipping: %s", fingerprint)
+        if fingerprint in seen:
+            self.logger.info(
+                "Duplicate signal detected, skipping: %s %s %s @ %s",
+                signal.symbol,
+                signal.action.value,
+                signal.quantity,
+                signal.timestamp,
+            )
             return True
 
-        # Mark as seen
-        self._seen_signals[signal_hash] = now
+        # Mark as seen, evicting the oldest entry once at capacity
+        seen[fingerprint] = now
+        if len(seen) > self._max_seen_signals:
+            seen.popitem(last=False)
         return False
 
-    async def process_webhook(self, payload: dict, signature: Optional[str] = None) -> Optional[Order]:
+    async def process_webhook(
+        self,
+        payload: dict,
+        signature: Optional[str] = None,
+        body: Optional[bytes] = None,
+    ) -> Optional[Order]:
         """
         Process an incoming TradingView webhook and execute the trade.
         
         Args:
             payload: Webhook payload dict
             signature: Optional HMAC signature
+            body: Raw request body, verified against ``signature``
             
         Returns:
             The executed order or None if rejected
         """
         # Validate webhook
-        if not self.validate_webhook(payload, signature):
+        if not self.validate_webhook(payload, signature, body):
             raise BrokerError("Invalid webhook payload or signature")
 
         # Parse payload
@@ -216,21 +284,23 @@ class TradingViewBroker(BaseBroker):
         )
 
         # Convert signal to order
-        order = await self._signal_to_order(signal, webhook.price)
+        order = self._signal_to_order(signal, webhook.price)
 
-        # Execute order through underlying broker
+        # Execute order through underlying broker; concurrent webhooks share
+        # a bounded number of submission slots
         try:
-            executed_order = await self.execution_broker.submit_order(order)
+            async with self._submit_semaphore:
+                executed_order = await self.execution_broker.submit_order(order)
             self.logger.info("TradingView signal executed: %s", executed_order.broker_order_id)
             return executed_order
         except Exception as e:
             self.logger.error("Failed to execute TradingView signal: %s", e, exc_info=True)
             raise
 
-    async def _signal_to_order(self, signal: Signal, market_price: float) -> Order:
+    def _signal_to_order(self, signal: Signal, market_price: float) -> Order:
         """Convert a signal to an order."""
         # Determine order side
-        if signal.action in {SignalAction.OPEN_LONG, SignalAction.CLOSE_SHORT}:
+        if signal.action in _BUY_ACTIONS:
             side = OrderSide.BUY if signal.action == SignalAction.OPEN_LONG else OrderSide.BUY_TO_COVER
         else:
             side = OrderSide.SELL if signal.action == SignalAction.CLOSE_LONG else OrderSide.SELL_SHORT
@@ -239,13 +309,13 @@ class TradingViewBroker(BaseBroker):
         price = None
         if self.order_type == OrderType.LIMIT:
             offset = market_price * (self.limit_offset_percent / 100)
-            if side in {OrderSide.BUY, OrderSide.BUY_TO_COVER}:
+            if side in _BUY_SIDES:
                 price = market_price + offset
             else:
                 price = max(0.01, market_price - offset)
 
         return Order(
-            id=str(uuid.uuid4()),
+            id=secrets.token_hex(16),
             symbol=signal.symbol,
             side=side,
             quantity=signal.quantity,
@@ -271,7 +341,33 @@ class TradingViewBroker(BaseBroker):
         return await self.execution_broker.get_open_orders()
 
     async def reconcile_positions(self, symbols: Iterable[str]) -> Dict[str, Position]:
-        """Delegate to execution broker."""
+        """Look up ``symbols`` concurrently, then delegate the sync.
+
+        Per-symbol lookups run in parallel (bounded by ``reconcile_concurrency``)
+        so brokers that hit a REST endpoint per symbol don't serialize the round
+        trips. If any lookup fails, ``BrokerError`` is raised before the
+        execution broker reconciles, rather than syncing from a partial view.
+        """
+        symbols = list(dict.fromkeys(symbols))
+
+        async def fetch(symbol: str) -> Optional[Position]:
+            async with self._reconcile_semaphore:
+                return await self.execution_broker.get_position(symbol)
+
+        results = await asyncio.gather(
+            *(fetch(symbol) for symbol in symbols), return_exceptions=True
+        )
+        failures = [
+            (symbol, result)
+            for symbol, result in zip(symbols, results)
+            if isinstance(result, BaseException)
+        ]
+        if failures:
+            failed = ", ".join(symbol for symbol, _ in failures)
+            raise BrokerError(
+                f"Failed to look up positions for {failed}"
+            ) from failures[0][1]
+
         return await self.execution_broker.reconcile_positions(symbols)
 
     def update_market_prices(self, prices: Dict[str, float]) -> None:
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
-import json
+import dataclasses
+import functools
 import os
+import re
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, MutableMapping, Optional
+from typing import Any, Dict, List, MutableMapping, Optional, Tuple
+
+import orjson
 
 
 CONFIG_ENV_PREFIX = "TRADING_BOT__"
@@ -17,6 +22,16 @@ DEFAULT_CONFIG_PATHS = (
     Path("config.example.json"),
 )
 
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+_VALID_MODES = frozenset({"backtest", "paper", "live"})
+_VALID_TIMEFRAMES = frozenset({"1m", "5m", "15m", "30m", "1h", "4h", "1d"})
+
+# Resolved config path -> (st_mtime_ns, st_size, stripped text)
+_CONFIG_TEXT_CACHE: Dict[Path, Tuple[int, int, str]] = {}
+
+_SECRET_KEY_RE = re.compile(r"key|secret|password|token", re.IGNORECASE)
+_NUMBER_START = frozenset("+-.")
+
 
 class ConfigValidationError(Exception):
     """Raised when configuration validation fails."""
@@ -104,10 +119,9 @@ class LoggingConfig:
     file: Optional[str] = None
 
     def __post_init__(self):
-        valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        if self.level.upper() not in valid_levels:
+        if self.level.upper() not in _VALID_LOG_LEVELS:
             raise ConfigValidationError(
-                f"logging.level must be one of {valid_levels}, got {self.level}"
+                f"logging.level must be one of {sorted(_VALID_LOG_LEVELS)}, got {self.level}"
             )
 
 
@@ -125,10 +139,9 @@ class EngineConfig:
     logging: LoggingConfig = field(default_factory=LoggingConfig)
 
     def __post_init__(self):
-        valid_modes = {"backtest", "paper", "live"}
-        if self.mode not in valid_modes:
+        if self.mode not in _VALID_MODES:
             raise ConfigValidationError(
-                f"engine.mode must be one of {valid_modes}, got {self.mode}"
+                f"engine.mode must be one of {sorted(_VALID_MODES)}, got {self.mode}"
             )
 
         if not self.symbols:
@@ -138,10 +151,9 @@ class EngineConfig:
             if not symbol or not symbol.strip():
                 raise ConfigValidationError(f"Invalid symbol: '{symbol}'")
 
-        valid_timeframes = {"1m", "5m", "15m", "30m", "1h", "4h", "1d"}
-        if self.timeframe not in valid_timeframes:
+        if self.timeframe not in _VALID_TIMEFRAMES:
             raise ConfigValidationError(
-                f"engine.timeframe must be one of {valid_timeframes}, got {self.timeframe}"
+                f"engine.timeframe must be one of {sorted(_VALID_TIMEFRAMES)}, got {self.timeframe}"
             )
 
 
@@ -189,33 +201,50 @@ def _load_config_from_file(path: Optional[Path | str]) -> Dict[str, Any]:
 
 
 def _read_config(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as handle:
+    content = _read_config_text(path)
+    if not content:
+        return {"engine": {}}
+    if path.suffix.lower() == ".json":
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            raise ConfigValidationError(f"Invalid JSON in {path}: {e}")
+    msg = (
+        "Only JSON configuration files are supported in the reference "
+        "implementation. Please convert your YAML file to JSON or extend "
+        "the loader."
+    )
+    raise ValueError(msg)
+
+
+def _read_config_text(path: Path) -> str:
+    """Return the stripped file contents, re-reading only when the file changes.
+
+    Only the text is cached: callers mutate the Config they get back, so each
+    load still parses into fresh objects.
+    """
+    resolved = path.resolve()
+    stat = resolved.stat()
+    cached = _CONFIG_TEXT_CACHE.get(resolved)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    with resolved.open("r", encoding="utf-8") as handle:
         content = handle.read().strip()
-        if not content:
-            return {"engine": {}}
-        if path.suffix.lower() == ".json":
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError as e:
-                raise ConfigValidationError(f"Invalid JSON in {path}: {e}")
-        msg = (
-            "Only JSON configuration files are supported in the reference "
-            "implementation. Please convert your YAML file to JSON or extend "
-            "the loader."
-        )
-        raise ValueError(msg)
+    _CONFIG_TEXT_CACHE[resolved] = (stat.st_mtime_ns, stat.st_size, content)
+    return content
 
 
 def _extract_env_overrides() -> Dict[str, Any]:
     overrides: Dict[str, Any] = {}
     prefix_length = len(CONFIG_ENV_PREFIX)
-    for env_key, value in os.environ.items():
-        if not env_key.startswith(CONFIG_ENV_PREFIX):
-            continue
-        path_parts = env_key[prefix_length:].split("__")
-        if not path_parts:
-            continue
-        _insert_override(overrides, path_parts, value)
+    matching = [
+        (env_key[prefix_length:], value)
+        for env_key, value in os.environ.items()
+        if env_key.startswith(CONFIG_ENV_PREFIX)
+    ]
+    for suffix, value in matching:
+        _insert_override(overrides, suffix.split("__"), value)
     return overrides
 
 
@@ -243,17 +272,23 @@ def _parse_env_value(value: str) -> Any:
     if lowered in {"true", "false"}:
         return lowered == "true"
 
-    try:
-        if "." in value:
-            return float(value)
-        return int(value)
-    except ValueError:
-        pass
+    # int()/float() decide what counts as a number; a first-character check
+    # keeps symbols, modes and other words out of their exception handling.
+    # Both parsers skip surrounding whitespace and accept any Unicode digit,
+    # so the check looks at the stripped value and uses isdigit().
+    stripped = value.strip()
+    if stripped and (stripped[0] in _NUMBER_START or stripped[0].isdigit()):
+        try:
+            if "." in stripped:
+                return float(stripped)
+            return int(stripped)
+        except ValueError:
+            pass
 
     if value.startswith("[") or value.startswith("{"):
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
             pass
 
     return value
@@ -273,9 +308,11 @@ def _dict_to_config(data: Dict[str, Any]) -> Config:
     engine_data = data.get("engine", {})
     return Config(
         engine=EngineConfig(
-            mode=engine_data.get("mode", "backtest"),
-            symbols=list(engine_data.get("symbols", ["AAPL"])),
-            timeframe=engine_data.get("timeframe", "1m"),
+            mode=_intern(engine_data.get("mode", "backtest")),
+            # Symbols key every per-symbol dict in the engine, brokers and
+            # strategies; interned keys compare by identity on lookup
+            symbols=[_intern(s) for s in engine_data.get("symbols", ["AAPL"])],
+            timeframe=_intern(engine_data.get("timeframe", "1m")),
             data_provider=_make_dataclass(
                 DataProviderConfig, engine_data.get("data_provider", {})
             ),
@@ -293,11 +330,10 @@ def _make_dataclass(model_cls, values: Dict[str, Any]):
             f"Expected mapping for {model_cls.__name__}, got {type(values)!r}"
         )
 
-    import inspect
-
-    sig = inspect.signature(model_cls)
-    valid_fields = set(sig.parameters.keys())
-    filtered_values = {k: v for k, v in values.items() if k in valid_fields}
+    valid_fields = _valid_fields(model_cls)
+    filtered_values = {
+        k: _intern(v) for k, v in values.items() if k in valid_fields
+    }
 
     try:
         return model_cls(**filtered_values)
@@ -305,25 +341,38 @@ def _make_dataclass(model_cls, values: Dict[str, Any]):
         raise ConfigValidationError(f"Failed to create {model_cls.__name__}: {e}")
 
 
+@functools.lru_cache(maxsize=None)
+def _valid_fields(model_cls) -> frozenset[str]:
+    """Return the constructor field names of a config dataclass."""
+    return frozenset(f.name for f in dataclasses.fields(model_cls) if f.init)
+
+
+def _intern(value: Any) -> Any:
+    """Intern short enum-like strings (symbols, modes, component names, levels).
+
+    Only immutable leaves are shared between loads; config objects themselves
+    stay per-load because callers mutate them.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def mask_secrets(config: Config) -> Dict[str, Any]:
     """Create a dict representation with secrets masked for logging."""
-    import copy
-    import dataclasses
-
-    def mask_dict(d: Dict[str, Any]) -> Dict[str, Any]:
-        result = {}
-        for key, value in d.items():
-            key_lower = key.lower()
-            if any(
-                secret in key_lower for secret in ["key", "secret", "password", "token"]
-            ):
-                result[key] = "***"
-            elif isinstance(value, dict):
-                result[key] = mask_dict(value)
-            elif dataclasses.is_dataclass(value):
-                result[key] = mask_dict(dataclasses.asdict(value))
-            else:
-                result[key] = value
-        return result
-
-    return mask_dict(dataclasses.asdict(config))
+    return _mask_value(config)
+
+
+def _mask_value(value: Any) -> Any:
+    """Copy dataclasses, dicts and lists into plain containers, masking secrets."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        items = ((f.name, getattr(value, f.name)) for f in dataclasses.fields(value))
+    elif isinstance(value, (list, tuple)):
+        return type(value)(_mask_value(item) for item in value)
+    else:
+        return value
+
+    return {
+        key: "***" if _SECRET_KEY_RE.search(key) else _mask_value(item)
+        for key, item in items
+    }
@@ -3,19 +3,24 @@
 from __future__ import annotations
 
 import asyncio
-import random
+import functools
+import itertools
 from datetime import datetime, timedelta
 from typing import AsyncIterator, Dict, Iterable, List
 
+import numpy as np
+
 from bot.data_providers.base import BaseDataProvider
 from bot.models import Candle, Tick
 
+_BAR_INTERVAL = timedelta(minutes=1)
+
 
 class MockDataProvider(BaseDataProvider):
     """Simple deterministic data source for tests and examples."""
 
     def __init__(self, seed: int = 42, base_price: float = 100.0) -> None:
-        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed)
         self._base_price = base_price
         self._connected = False
 
@@ -33,35 +38,46 @@ class MockDataProvider(BaseDataProvider):
         timeframe: str,
     ) -> List[Candle]:
         del timeframe  # Not used in the mock implementation
-        candles: List[Candle] = []
-        current = start
-        price = self._base_price
-        while current <= end:
-            change = self._rng.uniform(-1, 1)
-            open_price = price
-            close_price = max(1.0, open_price + change)
-            high = max(open_price, close_price) + self._rng.random()
-            low = min(open_price, close_price) - self._rng.random()
-            volume = abs(change) * 100 + self._rng.uniform(10, 50)
-            candles.append(
-                Candle(
-                    symbol=symbol,
-                    timestamp=current,
-                    open=open_price,
-                    high=high,
-                    low=low,
-                    close=close_price,
-                    volume=volume,
-                )
-            )
-            price = close_price
-            current += timedelta(minutes=1)
-        return candles
+        if end < start:
+            return []
+        count = (end - start) // _BAR_INTERVAL + 1
+
+        rng = self._np_rng
+        change = rng.uniform(-1.0, 1.0, count)
+        high_noise = rng.random(count)
+        low_noise = rng.random(count)
+        volume_noise = rng.uniform(10.0, 50.0, count)
 
-    async def _generate_tick(self, symbol: str, last_price: float) -> Tick:
-        change = self._rng.uniform(-0.5, 0.5)
-        price = max(1.0, last_price + change)
-        return Tick(symbol=symbol, timestamp=datetime.utcnow(), price=price)
+        # close[i] = max(1.0, close[i-1] + change[i]) has a feedback clamp, but
+        # as a reflected random walk it has the closed form
+        # walk - min(0, running_min(walk)) with walk measured from the floor.
+        walk = (self._base_price - 1.0) + np.cumsum(change)
+        close = walk - np.minimum(np.minimum.accumulate(walk), 0.0) + 1.0
+        open_ = np.empty_like(close)
+        open_[0] = self._base_price
+        open_[1:] = close[:-1]
+        high = np.maximum(open_, close) + high_noise
+        low = np.minimum(open_, close) - low_noise
+        volume = np.abs(change) * 100 + volume_noise
+
+        # Positional construction through a bound constructor with the symbol
+        # fixed up front; this fill loop is the only per-candle Python work.
+        # high/low bracket open/close by construction, so skip validation.
+        make_candle = functools.partial(Candle.unchecked, symbol)
+        timestamps = itertools.accumulate(
+            itertools.repeat(_BAR_INTERVAL, count - 1), initial=start
+        )
+        return list(
+            map(
+                make_candle,
+                timestamps,
+                open_.tolist(),
+                high.tolist(),
+                low.tolist(),
+                close.tolist(),
+                volume.tolist(),
+            )
+        )
 
     async def stream_prices(
         self, symbols: Iterable[str]
@@ -69,12 +85,17 @@ class MockDataProvider(BaseDataProvider):
         if not self._connected:
             raise RuntimeError("Data provider is not connected. Call connect() first.")
 
-        prices = {symbol: self._base_price for symbol in symbols}
+        symbols = list(dict.fromkeys(symbols))
+        prices = np.full(len(symbols), self._base_price)
         while self._connected:
-            updates: Dict[str, Tick] = {}
-            for symbol in list(prices.keys()):
-                tick = await self._generate_tick(symbol, prices[symbol])
-                prices[symbol] = tick.price
-                updates[symbol] = tick
-            yield updates
+            # Step every symbol's random walk in one vectorized draw; all ticks
+            # in a batch share one clock read
+            prices = np.maximum(
+                1.0, prices + self._np_rng.uniform(-0.5, 0.5, len(symbols))
+            )
+            timestamp = datetime.utcnow()
+            yield {
+                symbol: Tick(symbol=symbol, timestamp=timestamp, price=price)
+                for symbol, price in zip(symbols, prices.tolist())
+            }
             await asyncio.sleep(0.5)
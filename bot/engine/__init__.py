@@ -1,5 +1,6 @@
 """Engine orchestration package."""
 
-from .loop import TradingEngine, build_engine
+from .factory import build_components
+from .loop import TradingEngine, build_engine, install_uvloop
 
-__all__ = ["TradingEngine", "build_engine"]
+__all__ = ["TradingEngine", "build_components", "build_engine", "install_uvloop"]
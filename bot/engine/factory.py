@@ -0,0 +1,58 @@
+"""Component wiring shared by the runner scripts."""
+
+from __future__ import annotations
+
+from typing import Literal, Tuple
+
+from bot.brokers.paper import PaperBroker
+from bot.config import Config
+from bot.data_providers.mock import MockDataProvider
+from bot.risk.base import RiskManager
+from bot.risk.basic import BasicRiskConfig, BasicRiskManager
+from bot.risk.enhanced import EnhancedRiskConfig, EnhancedRiskManager
+from bot.strategies.example_sma import SimpleMovingAverageStrategy
+
+
+def build_components(
+    config: Config, risk: Literal["basic", "enhanced"] = "basic"
+) -> Tuple[MockDataProvider, PaperBroker, SimpleMovingAverageStrategy, RiskManager]:
+    """Build the mock provider, paper broker, SMA strategy and risk manager.
+
+    Every call returns fresh instances: the components carry run state
+    (RNG position, cash, fills, risk counters), so they are never shared
+    between engines. ``risk="enhanced"`` selects EnhancedRiskManager with PDT
+    rules and the circuit breaker enabled. The broker simulates latency
+    unless ``config.engine.mode`` is ``"backtest"``, so set the mode first.
+    """
+    engine_config = config.engine
+    data_provider = MockDataProvider(**engine_config.data_provider.params)
+    # Replayed bars have no network to wait on
+    broker = PaperBroker(
+        starting_cash=engine_config.broker.starting_cash,
+        simulate_latency=engine_config.mode != "backtest",
+    )
+    strategy = SimpleMovingAverageStrategy()
+
+    risk_manager: RiskManager
+    if risk == "enhanced":
+        risk_manager = EnhancedRiskManager(
+            EnhancedRiskConfig(
+                max_position_size=engine_config.risk.max_position_size,
+                max_daily_loss=engine_config.risk.max_daily_loss,
+                max_total_exposure=engine_config.risk.max_total_exposure,
+                max_open_positions=engine_config.risk.max_open_positions,
+                starting_cash=engine_config.broker.starting_cash,
+                enforce_pdt_rules=True,
+                enable_circuit_breaker=True,
+            )
+        )
+    else:
+        risk_manager = BasicRiskManager(
+            BasicRiskConfig(
+                max_position_size=engine_config.risk.max_position_size,
+                max_daily_loss=engine_config.risk.max_daily_loss,
+                starting_cash=engine_config.broker.starting_cash,
+            )
+        )
+
+    return data_provider, broker, strategy, risk_manager
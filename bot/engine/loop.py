@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 import uuid
-from collections import defaultdict
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Optional
 
 from bot.brokers.base import (
@@ -20,6 +21,7 @@ from bot.config import Config
 from bot.data_providers.base import BaseDataProvider
 from bot.models import (
     Candle,
+    CandleRing,
     MarketState,
     Order,
     OrderSide,
@@ -32,6 +34,26 @@ from bot.models import (
 from bot.risk.base import RiskManager
 from bot.strategies.base import Strategy
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is unavailable on Windows
+    uvloop = None
+
+# Candles kept per symbol while streaming live/paper data
+STREAMING_HISTORY_SIZE = 500
+
+# Order ids: a per-process random prefix plus a monotonic counter, unique
+# across restarts without a urandom read per order
+_ORDER_ID_PREFIX = uuid.uuid4().hex[:8]
+_order_sequence = itertools.count(1)
+
+_SIGNAL_SIDE: Dict[SignalAction, OrderSide] = {
+    SignalAction.OPEN_LONG: OrderSide.BUY,
+    SignalAction.CLOSE_SHORT: OrderSide.BUY_TO_COVER,
+    SignalAction.CLOSE_LONG: OrderSide.SELL,
+    SignalAction.OPEN_SHORT: OrderSide.SELL_SHORT,
+}
+
 
 class TradingEngine:
     """Coordinates data ingestion, strategy execution, and order routing."""
@@ -57,6 +79,14 @@ class TradingEngine:
         self.consecutive_errors = 0
         self.max_consecutive_errors = 5
 
+        # Broker submissions attempted so far, and whether portfolio_state has
+        # been synced from the broker at least once (see _process_iteration)
+        self._submission_count = 0
+        self._portfolio_synced = False
+
+        # Candles replayed by the last backtest, per symbol, for reporting
+        self.backtest_history: Dict[str, List[Candle]] = {}
+
     async def run(self, iterations: Optional[int] = None) -> None:
         mode = self.config.engine.mode
         self.logger.info("Starting trading engine in %s mode", mode)
@@ -95,9 +125,21 @@ class TradingEngine:
             history[symbol] = self.data_provider.get_historical_data(
                 symbol, start, end, timeframe
             )
+        self.backtest_history = history
+
+        self.strategy.prepare_backtest(history)
 
-        candles_history: Dict[str, List[Candle]] = defaultdict(list)
         max_length = max(len(series) for series in history.values()) if history else 0
+        # Backtests keep each symbol's whole window, so the rings never wrap
+        candles_history: Dict[str, CandleRing] = {
+            symbol: CandleRing(max(len(series), 1))
+            for symbol, series in history.items()
+        }
+        tracks = [
+            (symbol, series, candles_history[symbol])
+            for symbol, series in history.items()
+        ]
+        market_state = MarketState(candles=MappingProxyType(candles_history))
 
         for index in range(max_length):
             if self.circuit_breaker_tripped:
@@ -105,21 +147,24 @@ class TradingEngine:
                 break
 
             latest_prices: Dict[str, float] = {}
-            for symbol, series in history.items():
+            for symbol, series, ring in tracks:
                 if index >= len(series):
                     continue
                 candle = series[index]
-                candles_history[symbol].append(candle)
+                ring.append(candle)
                 latest_prices[symbol] = candle.close
 
             if not latest_prices:
                 continue
 
-            await self._process_iteration(candles_history, latest_prices)
+            await self._process_iteration(market_state, latest_prices)
 
     async def _run_streaming(self, iterations: Optional[int]) -> None:
         symbols = self.config.engine.symbols
-        candles_history: Dict[str, List[Candle]] = defaultdict(list)
+        candles_history: Dict[str, CandleRing] = {
+            symbol: CandleRing(STREAMING_HISTORY_SIZE) for symbol in symbols
+        }
+        market_state = MarketState(candles=MappingProxyType(candles_history))
         iteration_count = 0
 
         async for ticks in self.data_provider.stream_prices(symbols):
@@ -131,45 +176,66 @@ class TradingEngine:
             timestamp = datetime.utcnow()
 
             for symbol, price in latest_prices.items():
-                candles_history[symbol].append(
-                    self._tick_to_candle(symbol, price, timestamp)
-                )
-                candles_history[symbol] = candles_history[symbol][-500:]
-
-            await self._process_iteration(candles_history, latest_prices, ticks=ticks)
+                ring = candles_history.get(symbol)
+                if ring is None:
+                    # Provider sent a symbol outside the configured set
+                    ring = candles_history[symbol] = CandleRing(STREAMING_HISTORY_SIZE)
+                ring.append(self._tick_to_candle(symbol, price, timestamp))
+
+            await self._process_iteration(
+                market_state, latest_prices, ticks=ticks, timestamp=timestamp
+            )
 
             iteration_count += 1
             if iterations is not None and iteration_count >= iterations:
                 break
 
-        await asyncio.sleep(0)
-
     async def _process_iteration(
         self,
-        candles_history: Dict[str, List[Candle]],
+        market_state: MarketState,
         latest_prices: Dict[str, float],
         ticks: Optional[Dict[str, Tick]] = None,
+        timestamp: Optional[datetime] = None,
     ) -> None:
-        """Process a single iteration with comprehensive error handling."""
+        """Process a single iteration with comprehensive error handling.
+
+        ``market_state`` is created once per run over a read-only view of the
+        live candle rings (nothing is copied per bar; MarketState.snapshot
+        copies on request) and is refreshed in place here.
+        """
         try:
             self.broker.update_market_prices(latest_prices)
 
-            market_state = MarketState(
-                candles={
-                    symbol: list(series) for symbol, series in candles_history.items()
-                },
-                ticks=ticks or {},
-            )
+            if ticks is not None:
+                market_state.ticks = ticks
+            market_state.timestamp = timestamp or datetime.utcnow()
+            # Only symbols priced this cycle got a new bar
+            market_state.updated_symbols = latest_prices.keys()
 
             raw_signals = self.strategy.on_bar(market_state, self.portfolio_state)
             signals = list(raw_signals) if raw_signals else []
 
+            submissions_before = self._submission_count
             for signal in signals:
                 await self._process_signal(signal, market_state, latest_prices)
 
-            # Update portfolio state
-            self.portfolio_state.cash = await self.broker.get_balance()
-            self.portfolio_state.positions = await self.broker.get_positions()
+            # In a backtest nothing but this loop trades, so cash and positions
+            # can only change when an order was sent this bar. Live/paper runs
+            # always refresh since orders can also arrive via the API/webhooks.
+            if (
+                self._portfolio_synced
+                and self._submission_count == submissions_before
+                and self.config.engine.mode == "backtest"
+            ):
+                return
+
+            # Update portfolio state; both requests go out together
+            cash, positions = await asyncio.gather(
+                self.broker.get_balance(), self.broker.get_positions()
+            )
+            self.portfolio_state.cash = cash
+            self.portfolio_state.positions = positions
+            self._portfolio_synced = True
 
         except Exception as e:
             self.logger.error("Error in engine iteration: %s", e, exc_info=True)
@@ -193,11 +259,21 @@ class TradingEngine:
             )
 
             if not approved:
-                self.logger.debug("Signal rejected by risk manager: %s", signal)
+                # The risk manager already warns with the reason; skip
+                # gathering the arguments when debug logging is off
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "Signal rejected by risk manager: %s %s %s",
+                        signal.action.value,
+                        signal.symbol,
+                        signal.quantity,
+                    )
                 return
 
             # Convert to order
-            order = self._signal_to_order(approved, latest_prices)
+            order = self._signal_to_order(
+                approved, latest_prices, market_state.timestamp
+            )
             if order is None:
                 return
 
@@ -237,8 +313,20 @@ class TradingEngine:
         """Submit order with exponential backoff retry."""
         for attempt in range(max_retries):
             try:
+                self._submission_count += 1
                 result = await self.broker.submit_order(order)
-                self.logger.info("Submitted order %s", order)
+                # The broker may fill in place on positions shared with us
+                self.portfolio_state.invalidate()
+                # Log primitives rather than the Order repr, which walks every
+                # dataclass field (fills included) on each submission
+                self.logger.info(
+                    "Submitted order %s: %s %s %s @ %s",
+                    order.id,
+                    order.side.value,
+                    order.quantity,
+                    order.symbol,
+                    order.price,
+                )
                 return result
 
             except ConnectionError as e:
@@ -255,8 +343,16 @@ class TradingEngine:
                     raise
 
     def _signal_to_order(
-        self, signal: Signal, latest_prices: Dict[str, float]
+        self,
+        signal: Signal,
+        latest_prices: Dict[str, float],
+        timestamp: Optional[datetime] = None,
     ) -> Optional[Order]:
+        """Build a market order for ``signal`` stamped with ``timestamp``.
+
+        The engine passes the cycle timestamp so every order from one bar
+        shares it instead of each reading the clock.
+        """
         price = latest_prices.get(signal.symbol)
         if price is None:
             self.logger.warning("No price available for symbol %s", signal.symbol)
@@ -268,36 +364,24 @@ class TradingEngine:
             return None
 
         order = Order(
-            id=str(uuid.uuid4()),
+            id=f"{_ORDER_ID_PREFIX}-{next(_order_sequence)}",
             symbol=signal.symbol,
             side=side,
             quantity=signal.quantity,
             order_type=OrderType.MARKET,
             price=price,
+            timestamp=timestamp or datetime.utcnow(),
         )
         return order
 
     @staticmethod
     def _signal_to_side(action: SignalAction) -> Optional[OrderSide]:
-        mapping = {
-            SignalAction.OPEN_LONG: OrderSide.BUY,
-            SignalAction.CLOSE_SHORT: OrderSide.BUY_TO_COVER,
-            SignalAction.CLOSE_LONG: OrderSide.SELL,
-            SignalAction.OPEN_SHORT: OrderSide.SELL_SHORT,
-        }
-        return mapping.get(action)
+        return _SIGNAL_SIDE.get(action)
 
     @staticmethod
     def _tick_to_candle(symbol: str, price: float, timestamp: datetime) -> Candle:
-        return Candle(
-            symbol=symbol,
-            timestamp=timestamp,
-            open=price,
-            high=price,
-            low=price,
-            close=price,
-            volume=0.0,
-        )
+        # A flat single-price bar is always consistent
+        return Candle.unchecked(symbol, timestamp, price, price, price, price, 0.0)
 
 
 def build_engine(
@@ -315,3 +399,15 @@ def build_engine(
         strategy=strategy,
         risk_manager=risk_manager,
     )
+
+
+def install_uvloop() -> bool:
+    """Run subsequent event loops on uvloop when it is installed.
+
+    Call before ``asyncio.run``; returns False (default asyncio loop) where
+    uvloop is unavailable, e.g. on Windows.
+    """
+    if uvloop is None:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
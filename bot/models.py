@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Collection, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, overload
+
+import numpy as np
 
 
 class OrderSide(str, Enum):
@@ -59,6 +63,17 @@ class OrderStatus(str, Enum):
     FAILED = "failed"
 
 
+_TERMINAL_STATUSES = frozenset(
+    (
+        OrderStatus.FILLED,
+        OrderStatus.CANCELLED,
+        OrderStatus.REJECTED,
+        OrderStatus.EXPIRED,
+        OrderStatus.FAILED,
+    )
+)
+
+
 class SignalAction(str, Enum):
     """Actions that a trading signal can represent."""
 
@@ -82,13 +97,39 @@ class Candle:
 
     def __post_init__(self):
         """Validate candle data integrity."""
-        if self.high < max(self.open, self.close):
+        if self.high < self.open or self.high < self.close:
             raise ValueError(f"High {self.high} cannot be less than open/close")
-        if self.low > min(self.open, self.close):
+        if self.low > self.open or self.low > self.close:
             raise ValueError(f"Low {self.low} cannot be greater than open/close")
         if self.volume < 0:
             raise ValueError(f"Volume {self.volume} cannot be negative")
 
+    @classmethod
+    def unchecked(
+        cls,
+        symbol: str,
+        timestamp: datetime,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> Candle:
+        """Build a candle without validation, for sources consistent by construction.
+
+        Skips ``__init__``/``__post_init__``; live and external feeds should
+        keep using the regular constructor.
+        """
+        candle = cls.__new__(cls)
+        candle.symbol = symbol
+        candle.timestamp = timestamp
+        candle.open = open
+        candle.high = high
+        candle.low = low
+        candle.close = close
+        candle.volume = volume
+        return candle
+
 
 @dataclass(slots=True)
 class Tick:
@@ -138,7 +179,7 @@ class Order:
     fills: List[OrderFill] = field(default_factory=list)
     broker_order_id: Optional[str] = None
     error_message: Optional[str] = None
-    meta: Dict[str, any] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
     
     # Additional order attributes for production
     duration: OrderDuration = OrderDuration.DAY
@@ -151,13 +192,7 @@ class Order:
     @property
     def is_complete(self) -> bool:
         """Check if order is in a terminal state."""
-        return self.status in {
-            OrderStatus.FILLED,
-            OrderStatus.CANCELLED,
-            OrderStatus.REJECTED,
-            OrderStatus.EXPIRED,
-            OrderStatus.FAILED,
-        }
+        return self.status in _TERMINAL_STATUSES
 
     @property
     def remaining_quantity(self) -> float:
@@ -167,10 +202,11 @@ class Order:
     @property
     def average_fill_price(self) -> Optional[float]:
         """Calculate weighted average fill price."""
-        if not self.fills:
-            return None
-        total_value = sum(fill.quantity * fill.price for fill in self.fills)
-        total_quantity = sum(fill.quantity for fill in self.fills)
+        total_value = 0.0
+        total_quantity = 0.0
+        for fill in self.fills:
+            total_value += fill.quantity * fill.price
+            total_quantity += fill.quantity
         return total_value / total_quantity if total_quantity > 0 else None
 
     def add_fill(self, fill: OrderFill) -> None:
@@ -195,6 +231,21 @@ class Signal:
     meta: Dict[str, float] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
+    def with_quantity(self, quantity: float, **meta: float) -> Signal:
+        """Copy of the signal with a new quantity and ``meta`` merged in.
+
+        Keeps the original timestamp and confidence; without ``meta`` the
+        copy shares this signal's meta dict instead of duplicating it.
+        """
+        return Signal(
+            self.symbol,
+            self.action,
+            quantity,
+            self.confidence,
+            {**self.meta, **meta} if meta else self.meta,
+            self.timestamp,
+        )
+
 
 @dataclass(slots=True)
 class Position:
@@ -214,6 +265,8 @@ class Position:
 
     @property
     def is_flat(self) -> bool:
+        # Tolerance rather than == 0.0: positions built or assigned outside
+        # update() can carry float residuals
         return abs(self.quantity) < 1e-6
 
     def unrealized_pnl(self, current_price: float) -> float:
@@ -230,7 +283,7 @@ class Position:
 
     def update(self, fill_quantity: float, fill_price: float) -> None:
         """Update the position using a new fill."""
-        if self.quantity == 0:
+        if self.is_flat:
             # Starting fresh
             self.quantity = fill_quantity
             self.avg_price = fill_price
@@ -240,25 +293,21 @@ class Position:
 
         if abs(new_quantity) < 1e-6:
             # Position closed
-            self.quantity = 0.0
+            new_quantity = 0.0
             self.avg_price = 0.0
-        elif (self.quantity > 0 and fill_quantity > 0) or (self.quantity < 0 and fill_quantity < 0):
-            # Adding to position (same direction)
-            total_cost = (self.avg_price * abs(self.quantity)) + (
-                fill_price * abs(fill_quantity)
-            )
-            self.avg_price = total_cost / abs(new_quantity)
-            self.quantity = new_quantity
-        elif (self.quantity > 0 and fill_quantity < 0) or (self.quantity < 0 and fill_quantity > 0):
-            # Reducing or reversing position (opposite direction)
-            if abs(fill_quantity) >= abs(self.quantity):
-                # Position reversal - new position in opposite direction
-                self.quantity = new_quantity
-                self.avg_price = fill_price
-            else:
-                # Partial reduction - avg_price stays the same
-                self.quantity = new_quantity
-                # avg_price unchanged
+        elif (fill_quantity > 0) == (self.quantity > 0):
+            # Adding to position (same direction): both quantities share the
+            # sign of new_quantity, so the signed cost-weighted mean equals the
+            # absolute one without any abs() calls
+            self.avg_price = (
+                self.avg_price * self.quantity + fill_price * fill_quantity
+            ) / new_quantity
+        elif abs(fill_quantity) >= abs(self.quantity):
+            # Position reversal - new position in opposite direction
+            self.avg_price = fill_price
+        # Otherwise a partial reduction: avg_price stays the same
+
+        self.quantity = new_quantity
 
 
 @dataclass(slots=True)
@@ -276,7 +325,7 @@ class Trade:
     pnl: float
     pnl_percent: float
     commission: float = 0.0
-    meta: Dict[str, any] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -294,44 +343,67 @@ class Account:
 
 @dataclass(slots=True)
 class PortfolioState:
-    """Represents the portfolio as seen by the risk manager and strategies."""
+    """Represents the portfolio as seen by the risk manager and strategies.
+
+    Exposure totals are cached until ``positions`` is reassigned; code that
+    mutates the dict or its positions in place must call :meth:`invalidate`.
+    """
 
     cash: float
     positions: Dict[str, Position] = field(default_factory=dict)
     pending_orders: Dict[str, Order] = field(default_factory=dict)
+    # (positions dict the totals were computed from, long, short)
+    _exposure_cache: Optional[Tuple[Dict[str, Position], float, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def invalidate(self) -> None:
+        """Drop cached exposure totals after an in-place position change."""
+        self._exposure_cache = None
+
+    def exposure_totals(self) -> Tuple[float, float]:
+        """Return ``(long_exposure, short_exposure)``, cached between changes."""
+        positions = self.positions
+        cache = self._exposure_cache
+        if cache is not None and cache[0] is positions:
+            return cache[1], cache[2]
+
+        long_total = 0.0
+        short_total = 0.0
+        for position in positions.values():
+            quantity = position.quantity
+            if quantity > 0:
+                long_total += quantity * position.avg_price
+            elif quantity < 0:
+                short_total += abs(quantity * position.avg_price)
+        self._exposure_cache = (positions, long_total, short_total)
+        return long_total, short_total
 
     @property
     def net_exposure(self) -> float:
         """Aggregate absolute exposure across all open positions."""
-        return sum(
-            abs(position.quantity * position.avg_price)
-            for position in self.positions.values()
-        )
+        long_total, short_total = self.exposure_totals()
+        return long_total + short_total
 
     @property
     def long_exposure(self) -> float:
         """Total long position value."""
-        return sum(
-            position.quantity * position.avg_price
-            for position in self.positions.values()
-            if position.is_long
-        )
+        return self.exposure_totals()[0]
 
     @property
     def short_exposure(self) -> float:
         """Total short position value (absolute)."""
-        return sum(
-            abs(position.quantity * position.avg_price)
-            for position in self.positions.values()
-            if position.is_short
-        )
+        return self.exposure_totals()[1]
 
     def total_unrealized_pnl(self, prices: Dict[str, float]) -> float:
         """Calculate total unrealized P&L across all positions."""
+        # Inlined Position.unrealized_pnl: one price lookup per symbol and no
+        # method call; a flat position contributes (price - avg) * 0.0 == 0.0
         total = 0.0
         for symbol, position in self.positions.items():
-            if symbol in prices:
-                total += position.unrealized_pnl(prices[symbol])
+            price = prices.get(symbol)
+            if price is not None:
+                total += (price - position.avg_price) * position.quantity
         return total
 
     def equity(self, prices: Dict[str, float]) -> float:
@@ -339,13 +411,122 @@ class PortfolioState:
         return self.cash + self.total_unrealized_pnl(prices)
 
 
+class CandleRing(Sequence):
+    """Fixed-capacity candle history.
+
+    Behaves like a read-only ``Sequence[Candle]`` ordered oldest to newest, so
+    strategies can keep indexing and iterating it. ``append`` is O(1) and
+    overwrites the oldest candle once full. The ``open``/``high``/``low``/
+    ``close``/``volume`` properties build float64 arrays in the same order on
+    demand, so appends only pay for storing the candle.
+    """
+
+    __slots__ = ("capacity", "_candles", "_head", "_size")
+
+    def __init__(self, capacity: int = 500) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._candles: List[Optional[Candle]] = [None] * capacity
+        self._head = 0  # next slot to write
+        self._size = 0
+
+    def append(self, candle: Candle) -> None:
+        """Add ``candle`` as the newest entry, dropping the oldest when full."""
+        head = self._head
+        self._candles[head] = candle
+        self._head = (head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, index: int) -> Candle: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Candle]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            candles = self._candles
+            capacity = self.capacity
+            offset = self._start
+            if step != 1:
+                return [
+                    candles[(offset + i) % capacity] for i in range(start, stop, step)
+                ]
+            if stop <= start:
+                return []
+            # Contiguous window: at most two list slices of the buffer
+            first = (offset + start) % capacity
+            last = first + (stop - start)
+            if last <= capacity:
+                return candles[first:last]
+            return candles[first:] + candles[: last - capacity]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("CandleRing index out of range")
+        return self._candles[(self._start + index) % self.capacity]
+
+    def __iter__(self) -> Iterator[Candle]:
+        start = self._start
+        end = start + self._size
+        if end <= self.capacity:
+            yield from self._candles[start:end]
+        else:
+            yield from self._candles[start:]
+            yield from self._candles[: end - self.capacity]
+
+    @property
+    def _start(self) -> int:
+        return (self._head - self._size) % self.capacity
+
+    def _column(self, field_name: str) -> np.ndarray:
+        return np.fromiter(
+            map(attrgetter(field_name), self), dtype=np.float64, count=self._size
+        )
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._column("open")
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._column("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._column("low")
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._column("close")
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._column("volume")
+
+
 @dataclass(slots=True)
 class MarketState:
-    """Container with market information provided to strategies."""
+    """Container with market information provided to strategies.
+
+    Candle series are any ``Sequence[Candle]``; the engine passes a read-only
+    mapping of live :class:`CandleRing` instances, so strategies must not
+    mutate them or hold on to them across bars (use :meth:`snapshot`).
 
-    candles: Dict[str, List[Candle]]
+    ``updated_symbols`` names the symbols that received a new bar this cycle
+    (``None`` means all of them); the full history stays in ``candles``.
+    """
+
+    candles: Mapping[str, Sequence[Candle]]
     ticks: Dict[str, Tick] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    updated_symbols: Optional[Collection[str]] = None
 
     def latest_price(self, symbol: str) -> Optional[float]:
         """Return the last traded price for a symbol if available."""
@@ -356,7 +537,22 @@ class MarketState:
             return series[-1].close
         return None
 
+    def iter_updated(self) -> Iterator[tuple[str, Sequence[Candle]]]:
+        """Yield ``(symbol, candles)`` for the symbols updated this cycle."""
+        if self.updated_symbols is None:
+            yield from self.candles.items()
+            return
+        candles = self.candles
+        for symbol in self.updated_symbols:
+            series = candles.get(symbol)
+            if series is not None:
+                yield symbol, series
+
     def get_latest_candle(self, symbol: str) -> Optional[Candle]:
         """Get most recent candle for a symbol."""
         series = self.candles.get(symbol)
         return series[-1] if series else None
+
+    def snapshot(self, symbol: str) -> tuple[Candle, ...]:
+        """Return an immutable copy of a symbol's candles, oldest first."""
+        return tuple(self.candles.get(symbol, ()))
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from bot.models import MarketState, PortfolioState, Position, Signal, SignalAction
+from bot.models import MarketState, PortfolioState, Signal, SignalAction
 from bot.risk.base import RiskManager
 
+# Closing actions always pass, regardless of limits
+_CLOSING_ACTIONS = frozenset((SignalAction.CLOSE_LONG, SignalAction.CLOSE_SHORT))
+
 
 @dataclass(slots=True)
 class BasicRiskConfig:
@@ -40,7 +43,7 @@ class BasicRiskManager(RiskManager):
         """Return the approved signal (optionally size‑adjusted), or None if rejected."""
 
         # Always allow closing positions, regardless of limits
-        if signal.action in {SignalAction.CLOSE_LONG, SignalAction.CLOSE_SHORT}:
+        if signal.action in _CLOSING_ACTIONS:
             return signal
 
         # Block new opens once daily loss exceeds the configured limit
@@ -48,7 +51,8 @@ class BasicRiskManager(RiskManager):
             return None
 
         # If no position size cap is configured, accept the signal
-        if self.config.max_position_size <= 0:
+        max_position_size = self.config.max_position_size
+        if max_position_size <= 0:
             return signal
 
         desired_qty = abs(signal.quantity)
@@ -56,31 +60,25 @@ class BasicRiskManager(RiskManager):
             return signal
 
         # Current absolute position for this symbol (0 if flat)
-        current_qty = abs(
-            portfolio_state.positions.get(
-                signal.symbol,
-                Position(signal.symbol, 0.0, 0.0),
-            ).quantity
-        )
+        position = portfolio_state.positions.get(signal.symbol)
+        current_qty = abs(position.quantity) if position is not None else 0.0
 
         # Reject if already at or above the cap
-        if current_qty >= self.config.max_position_size:
+        if current_qty >= max_position_size:
             return None
 
-        remaining = self.config.max_position_size - current_qty
+        remaining = max_position_size - current_qty
         if desired_qty <= remaining:
             # Within the cap, no adjustment needed
             return signal
 
         # Cap the order size to the remaining allowable quantity
-        adjusted_qty = remaining
-        return Signal(
-            symbol=signal.symbol,
-            action=signal.action,
-            quantity=adjusted_qty,
-            meta={**signal.meta, "capped_quantity": adjusted_qty, "adjusted": 1.0},
-        )
+        return signal.with_quantity(remaining, capped_quantity=remaining, adjusted=1.0)
 
     def _daily_loss_exceeded(self, portfolio_state: PortfolioState) -> bool:
-        loss = self.config.starting_cash - portfolio_state.cash
-        return self.config.max_daily_loss > 0 and loss >= self.config.max_daily_loss
+        # Check the limit first so an unlimited config skips the subtraction
+        max_daily_loss = self.config.max_daily_loss
+        return (
+            max_daily_loss > 0
+            and self.config.starting_cash - portfolio_state.cash >= max_daily_loss
+        )
@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+import bisect
 import logging
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, Optional
 
-from bot.models import MarketState, PortfolioState, Position, Signal, SignalAction
+from bot.models import MarketState, PortfolioState, Signal, SignalAction
 from bot.risk.base import RiskManager
 
+# Closing actions skip the opening-position limits
+_CLOSING_ACTIONS = frozenset((SignalAction.CLOSE_LONG, SignalAction.CLOSE_SHORT))
+
+# Activity windows; building a timedelta per check costs far more than the
+# datetime arithmetic it feeds
+_RATE_WINDOW = timedelta(minutes=1)
+_ORDER_HISTORY = timedelta(hours=1)
+_DAY_TRADE_WINDOW = timedelta(days=5)
+
 
 @dataclass(slots=True)
 class EnhancedRiskConfig:
@@ -42,34 +53,49 @@ class EnhancedRiskConfig:
 
 @dataclass
 class TradeActivity:
-    """Track trading activity for rate limiting and PDT compliance."""
+    """Track trading activity for rate limiting and PDT compliance.
+
+    Timestamps are recorded in time order, so both windows are trimmed from
+    the left and counted by bisection instead of rebuilt or rescanned.
+    """
     
-    order_timestamps: list[datetime] = field(default_factory=list)
+    order_timestamps: Deque[datetime] = field(default_factory=deque)
     day_trades_count: int = 0
-    day_trades_dates: list[datetime] = field(default_factory=list)
+    day_trades_dates: Deque[datetime] = field(default_factory=deque)
     last_entry_timestamp: Optional[datetime] = None
     
+    @property
+    def last_entry_date(self) -> Optional[date]:
+        """Calendar date of the last entry, derived from its timestamp."""
+        timestamp = self.last_entry_timestamp
+        return timestamp.date() if timestamp is not None else None
+    
     def add_order(self, timestamp: datetime) -> None:
         """Record an order timestamp."""
         self.order_timestamps.append(timestamp)
         
         # Keep only last hour of timestamps
-        cutoff = timestamp - timedelta(hours=1)
-        self.order_timestamps = [ts for ts in self.order_timestamps if ts > cutoff]
+        _trim(self.order_timestamps, timestamp - _ORDER_HISTORY)
     
     def add_day_trade(self, timestamp: datetime) -> None:
         """Record a day trade."""
         self.day_trades_dates.append(timestamp)
         
         # Keep only last 5 days
-        cutoff = timestamp - timedelta(days=5)
-        self.day_trades_dates = [dt for dt in self.day_trades_dates if dt > cutoff]
+        _trim(self.day_trades_dates, timestamp - _DAY_TRADE_WINDOW)
         self.day_trades_count = len(self.day_trades_dates)
     
     def get_orders_in_last_minute(self, now: datetime) -> int:
         """Count orders in the last minute."""
-        cutoff = now - timedelta(minutes=1)
-        return sum(1 for ts in self.order_timestamps if ts > cutoff)
+        cutoff = now - _RATE_WINDOW
+        timestamps = self.order_timestamps
+        return len(timestamps) - bisect.bisect_right(timestamps, cutoff)
+
+
+def _trim(timestamps: Deque[datetime], cutoff: datetime) -> None:
+    """Drop timestamps at or before ``cutoff`` from the (oldest-first) left."""
+    while timestamps and timestamps[0] <= cutoff:
+        timestamps.popleft()
 
 
 class EnhancedRiskManager(RiskManager):
@@ -80,7 +106,9 @@ class EnhancedRiskManager(RiskManager):
         self.logger = logging.getLogger(self.__class__.__name__)
         
         # Track activity per symbol
-        self.activity: Dict[str, TradeActivity] = {}
+        self.activity: Dict[str, TradeActivity] = defaultdict(TradeActivity)
+        # Orders across all symbols, oldest first, for the global rate limit
+        self._global_order_times: Deque[datetime] = deque()
         
         # Circuit breaker state
         self.circuit_breaker_tripped = False
@@ -98,11 +126,13 @@ class EnhancedRiskManager(RiskManager):
         market_state: MarketState,
     ) -> Signal | None:
         """Validate signal through multiple risk checks."""
+        # One clock read so every check sees the same instant
+        now = datetime.utcnow()
         
         # Always allow closing positions
-        if signal.action in {SignalAction.CLOSE_LONG, SignalAction.CLOSE_SHORT}:
+        if signal.action in _CLOSING_ACTIONS:
             # But check if this would be a day trade
-            if self._would_be_day_trade(signal, portfolio_state):
+            if self._would_be_day_trade(signal, now.date()):
                 if not self._check_pdt_compliance(portfolio_state):
                     self.logger.warning(
                         "Closing position blocked: would violate PDT rules for %s",
@@ -111,37 +141,43 @@ class EnhancedRiskManager(RiskManager):
                     return None
             return signal
         
+        # Cheap bookkeeping checks first so signals they reject skip the
+        # mark-to-market below. Check rate limiting:
+        if not self._check_rate_limits(signal, now):
+            self.logger.warning("Signal rejected: rate limit exceeded for %s", signal.symbol)
+            return None
+        
+        # Check position count limit
+        if not self._check_position_count(signal, portfolio_state):
+            self.logger.warning("Signal rejected: max open positions reached")
+            return None
+        
+        # Mark the portfolio to market once for the equity-based checks. The
+        # circuit breaker runs ahead of the remaining loss checks so a large
+        # loss still trips it rather than being rejected by them first.
+        current_equity = self._current_equity(portfolio_state, market_state)
+        
         # Check circuit breaker
-        if not self._check_circuit_breaker(portfolio_state, market_state):
+        if not self._check_circuit_breaker(current_equity, now):
             self.logger.warning("Signal rejected: circuit breaker tripped")
             return None
         
         # Check drawdown limits
-        if not self._check_drawdown_limit(portfolio_state, market_state):
+        if not self._check_drawdown_limit(current_equity):
             self.logger.warning("Signal rejected: drawdown limit exceeded")
             return None
         
         # Check daily loss limit
-        if self._daily_loss_exceeded(portfolio_state):
+        if self._daily_loss_exceeded(portfolio_state, now):
             self.logger.warning("Signal rejected: daily loss limit exceeded")
             return None
         
-        # Check rate limiting
-        if not self._check_rate_limits(signal):
-            self.logger.warning("Signal rejected: rate limit exceeded for %s", signal.symbol)
-            return None
-        
         # Check PDT compliance for new positions
-        if self._would_be_day_trade(signal, portfolio_state):
+        if self._would_be_day_trade(signal, now.date()):
             if not self._check_pdt_compliance(portfolio_state):
                 self.logger.warning("Signal rejected: PDT rules for %s", signal.symbol)
                 return None
         
-        # Check position count limit
-        if not self._check_position_count(signal, portfolio_state):
-            self.logger.warning("Signal rejected: max open positions reached")
-            return None
-        
         # Check total exposure limit (can adjust quantity)
         symbol = signal.symbol  # Store symbol before checks that might return None
         signal = self._check_total_exposure(signal, portfolio_state, market_state)
@@ -156,19 +192,31 @@ class EnhancedRiskManager(RiskManager):
             return None
         
         # Record the order
-        self._record_order(symbol)
+        self._record_order(symbol, now)
         
         return signal
 
-    def _check_circuit_breaker(
-        self, portfolio_state: PortfolioState, market_state: MarketState
-    ) -> bool:
+    @staticmethod
+    def _current_equity(
+        portfolio_state: PortfolioState, market_state: MarketState
+    ) -> float:
+        """Cash plus unrealized P&L at the latest prices (0 when unpriced).
+
+        Same arithmetic as ``PortfolioState.equity`` but in one pass, without
+        building an intermediate prices dict.
+        """
+        latest_price = market_state.latest_price
+        pnl = 0.0
+        for symbol, position in portfolio_state.positions.items():
+            price = latest_price(symbol) or 0
+            pnl += (price - position.avg_price) * position.quantity
+        return portfolio_state.cash + pnl
+
+    def _check_circuit_breaker(self, current_equity: float, now: datetime) -> bool:
         """Check if circuit breaker should trip or reset."""
         if not self.config.enable_circuit_breaker:
             return True
         
-        now = datetime.utcnow()
-        
         # Check if circuit breaker should reset
         if self.circuit_breaker_tripped:
             if self.circuit_breaker_trip_time:
@@ -180,17 +228,15 @@ class EnhancedRiskManager(RiskManager):
                     return True
             return False
         
-        # Calculate current equity
-        prices = {symbol: market_state.latest_price(symbol) or 0 for symbol in portfolio_state.positions.keys()}
-        current_equity = portfolio_state.equity(prices)
-        
         # Update peak equity
         if current_equity > self.peak_equity:
             self.peak_equity = current_equity
         
-        # Check if we should trip the breaker
-        drawdown_percent = ((self.peak_equity - current_equity) / self.peak_equity) * 100
-        if drawdown_percent >= self.config.circuit_breaker_loss_percent:
+        # Check if we should trip the breaker; compared cross-multiplied so the
+        # common no-trip path does no division
+        drawdown = self.peak_equity - current_equity
+        if drawdown * 100 >= self.peak_equity * self.config.circuit_breaker_loss_percent:
+            drawdown_percent = drawdown / self.peak_equity * 100
             self.logger.critical(
                 "CIRCUIT BREAKER TRIPPED: %.2f%% drawdown from peak $%.2f to $%.2f",
                 drawdown_percent,
@@ -203,21 +249,17 @@ class EnhancedRiskManager(RiskManager):
         
         return True
 
-    def _check_drawdown_limit(
-        self, portfolio_state: PortfolioState, market_state: MarketState
-    ) -> bool:
+    def _check_drawdown_limit(self, current_equity: float) -> bool:
         """Check if current drawdown exceeds limit."""
-        prices = {symbol: market_state.latest_price(symbol) or 0 for symbol in portfolio_state.positions.keys()}
-        current_equity = portfolio_state.equity(prices)
-        
-        drawdown_percent = ((self.config.starting_cash - current_equity) / self.config.starting_cash) * 100
-        
-        return drawdown_percent < self.config.max_drawdown_percent
+        starting_cash = self.config.starting_cash
+        drawdown = starting_cash - current_equity
+        return drawdown * 100 < starting_cash * self.config.max_drawdown_percent
 
-    def _daily_loss_exceeded(self, portfolio_state: PortfolioState) -> bool:
+    def _daily_loss_exceeded(
+        self, portfolio_state: PortfolioState, now: datetime
+    ) -> bool:
         """Check if daily loss limit is exceeded."""
         # Reset daily tracking at start of day
-        now = datetime.utcnow()
         today = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
         if today > self.daily_reset_time:
@@ -227,27 +269,19 @@ class EnhancedRiskManager(RiskManager):
         loss = self.start_of_day_equity - portfolio_state.cash
         return self.config.max_daily_loss > 0 and loss >= self.config.max_daily_loss
 
-    def _check_rate_limits(self, signal: Signal) -> bool:
+    def _check_rate_limits(self, signal: Signal, now: datetime) -> bool:
         """Check if signal exceeds rate limits."""
-        now = datetime.utcnow()
-        
-        # Get or create activity tracker for this symbol
-        if signal.symbol not in self.activity:
-            self.activity[signal.symbol] = TradeActivity()
-        
-        activity = self.activity[signal.symbol]
-        
-        # Check symbol-specific rate limit
-        orders_this_minute = activity.get_orders_in_last_minute(now)
-        if orders_this_minute >= self.config.max_orders_per_symbol_per_minute:
-            return False
+        # Check symbol-specific rate limit; a symbol with no tracker has no
+        # orders yet, so reading one must not create it
+        activity = self.activity.get(signal.symbol)
+        if activity is not None:
+            orders_this_minute = activity.get_orders_in_last_minute(now)
+            if orders_this_minute >= self.config.max_orders_per_symbol_per_minute:
+                return False
         
         # Check global rate limit
-        total_orders = sum(
-            act.get_orders_in_last_minute(now)
-            for act in self.activity.values()
-        )
-        if total_orders >= self.config.max_orders_per_minute:
+        _trim(self._global_order_times, now - _RATE_WINDOW)
+        if len(self._global_order_times) >= self.config.max_orders_per_minute:
             return False
         
         return True
@@ -265,31 +299,25 @@ class EnhancedRiskManager(RiskManager):
         # Note: This is simplified - real PDT tracking requires more complex logic
         return True  # Allow for now, would need to track actual day trades
 
-    def _would_be_day_trade(self, signal: Signal, portfolio_state: PortfolioState) -> bool:
+    def _would_be_day_trade(self, signal: Signal, today: date) -> bool:
         """Check if this signal would create a day trade."""
-        if signal.symbol not in self.activity:
+        activity = self.activity.get(signal.symbol)
+        if activity is None:
             return False
         
-        activity = self.activity[signal.symbol]
-        
         # If we entered a position today and are closing it, it's a day trade
-        if activity.last_entry_timestamp:
-            today = datetime.utcnow().date()
-            entry_date = activity.last_entry_timestamp.date()
-            return entry_date == today
-        
-        return False
+        return activity.last_entry_date == today
 
     def _check_position_count(self, signal: Signal, portfolio_state: PortfolioState) -> bool:
         """Check if adding this position would exceed max open positions."""
-        current_positions = len([p for p in portfolio_state.positions.values() if not p.is_flat])
+        positions = portfolio_state.positions
         
         # If we already have a position in this symbol, don't count it as new
-        if signal.symbol in portfolio_state.positions:
-            existing_pos = portfolio_state.positions[signal.symbol]
-            if not existing_pos.is_flat:
-                return True
+        existing_pos = positions.get(signal.symbol)
+        if existing_pos is not None and not existing_pos.is_flat:
+            return True
         
+        current_positions = sum(1 for p in positions.values() if not p.is_flat)
         return current_positions < self.config.max_open_positions
 
     def _check_total_exposure(
@@ -317,23 +345,22 @@ class EnhancedRiskManager(RiskManager):
         if available_exposure <= 0:
             return None  # Already at limit
         
-        max_quantity = available_exposure / price
+        # Whole shares that still fit; always fewer than requested here, since
+        # quantity * price already exceeds the available exposure
+        adjusted = int(available_exposure / price)
         
         # Cap to at least 1 share if there's any room
-        if max_quantity < 1.0:
+        if adjusted < 1:
             return None
         
-        return Signal(
-            symbol=signal.symbol,
-            action=signal.action,
-            quantity=int(max_quantity),
-        )
+        return signal.with_quantity(adjusted)
 
     def _check_position_size(
         self, signal: Signal, portfolio_state: PortfolioState
     ) -> Signal | None:
         """Check and adjust position size if needed."""
-        if self.config.max_position_size <= 0:
+        max_position_size = self.config.max_position_size
+        if max_position_size <= 0:
             return signal
         
         desired_qty = abs(signal.quantity)
@@ -341,36 +368,27 @@ class EnhancedRiskManager(RiskManager):
             return signal
         
         # Current absolute position for this symbol
-        current_qty = abs(
-            portfolio_state.positions.get(
-                signal.symbol,
-                Position(signal.symbol, 0.0, 0.0),
-            ).quantity
-        )
+        position = portfolio_state.positions.get(signal.symbol)
+        current_qty = abs(position.quantity) if position is not None else 0.0
         
         # Reject if already at or above the cap
-        if current_qty >= self.config.max_position_size:
+        if current_qty >= max_position_size:
             return None
         
-        remaining = self.config.max_position_size - current_qty
+        remaining = max_position_size - current_qty
         if desired_qty <= remaining:
             return signal
         
         # Cap the order size
-        adjusted_qty = remaining
-        return Signal(
-            symbol=signal.symbol,
-            action=signal.action,
-            quantity=adjusted_qty,
-            meta={**signal.meta, "capped_quantity": adjusted_qty, "adjusted": True},
+        return signal.with_quantity(
+            remaining, capped_quantity=remaining, adjusted=True
         )
 
-    def _record_order(self, symbol: str) -> None:
+    def _record_order(self, symbol: str, now: Optional[datetime] = None) -> None:
         """Record an order for rate limiting and tracking."""
-        now = datetime.utcnow()
-        
-        if symbol not in self.activity:
-            self.activity[symbol] = TradeActivity()
+        now = now or datetime.utcnow()
         
-        self.activity[symbol].add_order(now)
-        self.activity[symbol].last_entry_timestamp = now
+        activity = self.activity[symbol]
+        activity.add_order(now)
+        activity.last_entry_timestamp = now
+        self._global_order_times.append(now)
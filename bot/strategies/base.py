@@ -4,9 +4,9 @@ from __future__ import annotations
 
 import abc
 import logging
-from typing import Iterable, Optional
+from typing import Iterable, Mapping, Optional, Sequence
 
-from bot.models import MarketState, PortfolioState, Signal
+from bot.models import Candle, MarketState, PortfolioState, Signal
 
 
 class Strategy(abc.ABC):
@@ -30,6 +30,15 @@ class Strategy(abc.ABC):
             provided the strategy should fall back to ``self.logger``.
         """
 
+    def prepare_backtest(self, history: Mapping[str, Sequence[Candle]]) -> None:
+        """Hook executed with the full backtest window before the first bar.
+
+        Strategies whose indicators only depend on past candles can compute
+        them for the whole window here in one vectorized pass and have
+        :meth:`on_bar` look the values up, instead of recomputing them from
+        the candle history on every bar. The default does nothing.
+        """
+
     @abc.abstractmethod
     def on_bar(
         self,
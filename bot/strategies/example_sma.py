@@ -4,9 +4,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
 
-from bot.models import MarketState, PortfolioState, Signal, SignalAction
+import numpy as np
+
+from bot.models import Candle, MarketState, PortfolioState, Signal, SignalAction
 from bot.strategies.base import Strategy
 
 
@@ -30,6 +32,11 @@ class SimpleMovingAverageStrategy(Strategy):
         super().__init__()
         self.config = config or SimpleMovingAverageConfig()
         self._trend_state: Dict[str, str] = {}
+        # Backtest only: symbol -> (candle series, short SMA, long SMA) where
+        # the SMA arrays are indexed by bar position in the series
+        self._precomputed: Dict[
+            str, Tuple[Sequence[Candle], np.ndarray, np.ndarray]
+        ] = {}
 
     def on_start(
         self, config: object | None = None, logger: logging.Logger | None = None
@@ -60,20 +67,33 @@ class SimpleMovingAverageStrategy(Strategy):
             self.config.trade_quantity,
         )
 
+    def prepare_backtest(self, history: Mapping[str, Sequence[Candle]]) -> None:
+        # Rolling means for every bar of the window from one cumulative sum
+        self._precomputed = {}
+        for symbol, series in history.items():
+            if len(series) < self.config.long_window:
+                continue
+            closes = np.fromiter(
+                (candle.close for candle in series), dtype=np.float64, count=len(series)
+            )
+            self._precomputed[symbol] = (
+                series,
+                _rolling_mean(closes, self.config.short_window),
+                _rolling_mean(closes, self.config.long_window),
+            )
+
     def on_bar(
         self,
         market_state: MarketState,
         portfolio_state: PortfolioState,
     ) -> Iterable[Signal]:
         signals: List[Signal] = []
-        for symbol, candles in market_state.candles.items():
+        # Signals carry the cycle's timestamp rather than a clock read each
+        timestamp = market_state.timestamp
+        for symbol, candles in market_state.iter_updated():
             if len(candles) < self.config.long_window:
                 continue
-            closes = [candle.close for candle in candles]
-            short_avg = (
-                sum(closes[-self.config.short_window :]) / self.config.short_window
-            )
-            long_avg = sum(closes[-self.config.long_window :]) / self.config.long_window
+            short_avg, long_avg = self._moving_averages(symbol, candles)
 
             current_trend = self._trend_state.get(symbol, "flat")
             position = portfolio_state.positions.get(symbol)
@@ -84,6 +104,7 @@ class SimpleMovingAverageStrategy(Strategy):
                         action=SignalAction.OPEN_LONG,
                         quantity=self.config.trade_quantity,
                         meta={"short_avg": short_avg, "long_avg": long_avg},
+                        timestamp=timestamp,
                     )
                 )
                 self._trend_state[symbol] = "long"
@@ -96,10 +117,42 @@ class SimpleMovingAverageStrategy(Strategy):
                         action=SignalAction.CLOSE_LONG,
                         quantity=self.config.trade_quantity,
                         meta={"short_avg": short_avg, "long_avg": long_avg},
+                        timestamp=timestamp,
                     )
                 )
                 self._trend_state[symbol] = "flat"
         return signals
 
+    def _moving_averages(
+        self, symbol: str, candles: Sequence[Candle]
+    ) -> Tuple[float, float]:
+        index = len(candles) - 1
+        precomputed = self._precomputed.get(symbol)
+        # Use the backtest arrays only while the engine is replaying exactly
+        # the series they were computed from
+        if precomputed is not None:
+            series, short_avgs, long_avgs = precomputed
+            if index < len(series) and series[index] is candles[-1]:
+                return float(short_avgs[index]), float(long_avgs[index])
+
+        # Only the trailing long window matters; plain sums beat NumPy at
+        # these window sizes once the object-to-array copy is counted
+        short_window = self.config.short_window
+        long_window = self.config.long_window
+        closes = [candle.close for candle in candles[-long_window:]]
+        short_avg = sum(closes[-short_window:]) / short_window
+        long_avg = sum(closes) / long_window
+        return short_avg, long_avg
+
     def on_end(self) -> None:
+        self._precomputed = {}
         self.logger.info("SMA strategy finished execution")
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing ``window`` mean at every index (NaN before the window fills)."""
+    result = np.full(values.shape, np.nan)
+    cumulative = np.cumsum(values)
+    result[window - 1] = cumulative[window - 1]
+    result[window:] = cumulative[window:] - cumulative[:-window]
+    return result / window
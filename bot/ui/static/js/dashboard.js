@@ -237,8 +237,10 @@ class TradingBotDashboard {
         
         this.ws.onmessage = (event) => {
             try {
-                const message = JSON.parse(event.data);
-                this.handleWebSocketMessage(message);
+                // Bursts of queued updates arrive merged into a single array
+                const parsed = JSON.parse(event.data);
+                const messages = Array.isArray(parsed) ? parsed : [parsed];
+                messages.forEach((message) => this.handleWebSocketMessage(message));
             } catch (error) {
                 console.error('Error parsing WebSocket message:', error);
             }
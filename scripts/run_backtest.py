@@ -11,37 +11,18 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from bot.brokers.paper import PaperBroker
-from bot.config import Config, load_config
-from bot.data_providers.mock import MockDataProvider
+from bot.config import Config, ConfigValidationError, load_config
+from bot.engine.factory import build_components
 from bot.engine.logging_config import setup_logging
 from bot.engine.loop import TradingEngine
-from bot.risk.basic import BasicRiskConfig, BasicRiskManager
-from bot.strategies.example_sma import SimpleMovingAverageStrategy
-
-
-def _build_components(config: Config):
-    data_provider = MockDataProvider(**config.engine.data_provider.params)
-    broker = PaperBroker(starting_cash=config.engine.broker.starting_cash)
-    strategy = SimpleMovingAverageStrategy()
-    risk_cfg = BasicRiskConfig(
-        max_position_size=config.engine.risk.max_position_size,
-        max_daily_loss=config.engine.risk.max_daily_loss,
-        starting_cash=config.engine.broker.starting_cash,
-    )
-    risk_manager = BasicRiskManager(risk_cfg)
-    return data_provider, broker, strategy, risk_manager
 
 
 async def _run(config: Config) -> None:
-    data_provider, broker, strategy, risk_manager = _build_components(config)
+    data_provider, broker, strategy, risk_manager = build_components(config)
     engine = TradingEngine(config, data_provider, broker, strategy, risk_manager)
     await engine.run()
 
 
-from bot.config import Config, load_config, ConfigValidationError
-
-
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run the trading bot.")
     parser.add_argument(
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-"""Run a mock backtest and display a price chart."""
+"""Run a mock backtest and save (or display) a price chart."""
 
 import sys
 from pathlib import Path
@@ -9,11 +9,13 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import matplotlib
+import numpy as np
 
 # Ensure project root is on sys.path (same pattern as run_backtest.py)
 ROOT = Path(__file__).resolve().parents[1]
@@ -21,51 +23,37 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from bot.config import Config, load_config
-from bot.data_providers.mock import MockDataProvider
+from bot.engine.factory import build_components
 from bot.engine.logging_config import setup_logging
-from bot.engine.loop import TradingEngine
-from bot.risk.basic import BasicRiskConfig, BasicRiskManager
-from bot.strategies.example_sma import SimpleMovingAverageStrategy
-from bot.brokers.paper import PaperBroker
-
-
-def _build_components(config: Config):
-    """Construct components exactly like the existing scripts do."""
-    data_provider = MockDataProvider(**config.engine.data_provider.params)
-    broker = PaperBroker(starting_cash=config.engine.broker.starting_cash)
-    strategy = SimpleMovingAverageStrategy()
-    risk_cfg = BasicRiskConfig(
-        max_position_size=config.engine.risk.max_position_size,
-        max_daily_loss=config.engine.risk.max_daily_loss,
-        starting_cash=config.engine.broker.starting_cash,
-    )
-    risk_manager = BasicRiskManager(risk_cfg)
-    return data_provider, broker, strategy, risk_manager
+from bot.engine.loop import TradingEngine, install_uvloop
 
 
-async def _run_with_chart(config: Config) -> None:
+async def _run_with_chart(config: Config, output: Path, show: bool) -> None:
     # Force backtest mode for this script
     config.engine.mode = "backtest"
 
-    data_provider, broker, strategy, risk_manager = _build_components(config)
+    data_provider, broker, strategy, risk_manager = build_components(config)
     engine = TradingEngine(config, data_provider, broker, strategy, risk_manager)
 
-    # Get some mock historical data for visualization
-    symbol = config.engine.symbols[0]
-    timeframe = config.engine.timeframe
-    candles = data_provider.get_historical_data(
-        symbol=symbol,
-        start=None,
-        end=None,
-        timeframe=timeframe,
-    )
-    prices = [c.close for c in candles]
-
     print("[INFO] Running backtest...")
     await engine.run()
     print("[INFO] Backtest complete — generating chart...")
 
-    # Plot price series
+    # Chart the candles the backtest replayed rather than generating a second
+    # series; the close column goes to matplotlib as one array
+    symbol = config.engine.symbols[0]
+    candles = engine.backtest_history.get(symbol, [])
+    prices = np.fromiter(
+        (c.close for c in candles), dtype=np.float64, count=len(candles)
+    )
+
+    _plot(symbol, prices, output, show)
+
+
+def _plot(symbol: str, prices: np.ndarray, output: Path, show: bool) -> None:
+    # Imported here so main() has picked the backend first
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 5))
     plt.plot(prices, label=f"{symbol} mock price")
     plt.title("Mock Backtest — Simple Moving Average Strategy")
@@ -74,14 +62,37 @@ async def _run_with_chart(config: Config) -> None:
     plt.grid(True)
     plt.legend()
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.savefig(output, dpi=100)
+        print(f"[INFO] Chart saved to {output}")
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a mock backtest and chart it.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("backtest_chart.png"),
+        help="PNG file to write the chart to (default: backtest_chart.png)",
+    )
+    parser.add_argument(
+        "--show",
+        action="store_true",
+        help="Open the chart in an interactive window instead of saving it",
+    )
+    args = parser.parse_args()
+
+    # Headless Agg unless a window was asked for: no GUI toolkit import
+    if not args.show:
+        matplotlib.use("Agg")
+
     setup_logging()
     config_path = Path("config.example.json")
     config = load_config(config_path)
-    asyncio.run(_run_with_chart(config))
+    install_uvloop()
+    asyncio.run(_run_with_chart(config, args.output, args.show))
 
 
 if __name__ == "__main__":
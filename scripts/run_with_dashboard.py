@@ -6,65 +6,60 @@ import argparse
 import asyncio
 import logging
 import sys
-import threading
+import time
+from datetime import datetime
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from bot.api.server import run_server, set_bot_instance
-from bot.brokers.paper import PaperBroker
+from bot.api.server import create_server, run_server, set_bot_instance
 from bot.config import Config, load_config
-from bot.data_providers.mock import MockDataProvider
+from bot.engine.factory import build_components
 from bot.engine.logging_config import setup_logging
-from bot.engine.loop import TradingEngine
-from bot.risk.enhanced import EnhancedRiskConfig, EnhancedRiskManager
-from bot.strategies.example_sma import SimpleMovingAverageStrategy
-
-
-def _build_components(config: Config):
-    """Build all bot components."""
-    data_provider = MockDataProvider(**config.engine.data_provider.params)
-    broker = PaperBroker(starting_cash=config.engine.broker.starting_cash)
-    strategy = SimpleMovingAverageStrategy()
-    
-    # Use enhanced risk manager with production features
-    risk_cfg = EnhancedRiskConfig(
-        max_position_size=config.engine.risk.max_position_size,
-        max_daily_loss=config.engine.risk.max_daily_loss,
-        max_total_exposure=config.engine.risk.max_total_exposure,
-        max_open_positions=config.engine.risk.max_open_positions,
-        starting_cash=config.engine.broker.starting_cash,
-        enforce_pdt_rules=True,
-        enable_circuit_breaker=True,
-    )
-    risk_manager = EnhancedRiskManager(risk_cfg)
-    
-    return data_provider, broker, strategy, risk_manager
+from bot.engine.loop import TradingEngine, install_uvloop
 
 
 async def run_bot(config: Config, iterations: int | None = None) -> None:
     """Run the trading bot."""
-    data_provider, broker, strategy, risk_manager = _build_components(config)
+    data_provider, broker, strategy, risk_manager = build_components(
+        config, risk="enhanced"
+    )
     engine = TradingEngine(config, data_provider, broker, strategy, risk_manager)
     
     # Set bot instance for API access
     set_bot_instance(engine)
     
     # Add start time for uptime tracking
-    import datetime
-    engine.start_time = datetime.datetime.utcnow()
+    engine.start_time = datetime.utcnow()
+    engine.start_monotonic = time.monotonic()
     
     await engine.run(iterations=iterations)
 
 
 def start_api_server(host: str = "0.0.0.0", port: int = 8000):
-    """Start the API server in a separate thread."""
+    """Start the API server on its own event loop (UI-only mode)."""
     logging.info(f"Starting API server on {host}:{port}")
     run_server(host=host, port=port)
 
 
+async def run_with_dashboard(engine: TradingEngine, host: str, port: int) -> None:
+    """Serve the API on the engine's event loop while the engine runs.
+
+    The server stops once the engine finishes, as the process did when the
+    API ran in a daemon thread.
+    """
+    logging.info(f"Starting API server on {host}:{port}")
+    server = create_server(host, port)
+    api_task = asyncio.create_task(server.serve())
+    try:
+        await engine.run(iterations=None)
+    finally:
+        server.should_exit = True
+        await api_task
+
+
 def main() -> None:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -113,6 +108,8 @@ def main() -> None:
         print(f"ERROR: Failed to load configuration: {e}", file=sys.stderr)
         sys.exit(1)
     
+    install_uvloop()
+
     try:
         if args.ui_only:
             # Run only the UI server (for development/testing)
@@ -128,31 +125,21 @@ def main() -> None:
             logger.info(f"Dashboard will be available at http://{args.host}:{args.port}")
             
             # Build bot components first
-            data_provider, broker, strategy, risk_manager = _build_components(config)
+            data_provider, broker, strategy, risk_manager = build_components(
+                config, risk="enhanced"
+            )
             engine = TradingEngine(config, data_provider, broker, strategy, risk_manager)
             
             # Set bot instance for API access BEFORE starting server
             set_bot_instance(engine)
             
             # Add start time for uptime tracking
-            import datetime
-            engine.start_time = datetime.datetime.utcnow()
-            
-            # Start API server in background thread
-            api_thread = threading.Thread(
-                target=start_api_server,
-                args=(args.host, args.port),
-                daemon=True
-            )
-            api_thread.start()
-            
-            # Give the API server time to start
-            import time
-            time.sleep(2)
+            engine.start_time = datetime.utcnow()
+            engine.start_monotonic = time.monotonic()
             
-            # Run the bot in main thread
+            # Serve the API and run the bot on one event loop
             logger.info("Bot initialization complete, starting main loop")
-            asyncio.run(engine.run(iterations=None))
+            asyncio.run(run_with_dashboard(engine, args.host, args.port))
             
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
@@ -0,0 +1,329 @@
+"""Tests for the FastAPI dashboard and webhook server."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import hmac
+from datetime import datetime
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from bot.api import server
+from bot.brokers.paper import PaperBroker
+from bot.brokers.tradingview import TradingViewBroker
+from bot.config import Config
+from bot.data_providers.mock import MockDataProvider
+from bot.engine.loop import TradingEngine
+from bot.models import Order, OrderSide, OrderType
+from bot.risk.basic import BasicRiskConfig, BasicRiskManager
+from bot.strategies.example_sma import SimpleMovingAverageStrategy
+
+WEBHOOK_SECRET = "test_secret"
+
+
+@pytest.fixture
+def paper_broker():
+    """Create a connected paper broker with a price for AAPL."""
+    broker = PaperBroker(starting_cash=100000)
+    asyncio.run(broker.connect())
+    broker.update_market_prices({"AAPL": 150.0})
+    return broker
+
+
+@pytest.fixture
+def client(paper_broker):
+    """Serve the app for an engine routing webhooks to the paper broker."""
+    config = Config()
+    broker = TradingViewBroker(
+        execution_broker=paper_broker, webhook_secret=WEBHOOK_SECRET
+    )
+    risk_manager = BasicRiskManager(
+        BasicRiskConfig(
+            max_position_size=config.engine.risk.max_position_size,
+            max_daily_loss=config.engine.risk.max_daily_loss,
+            starting_cash=config.engine.broker.starting_cash,
+        )
+    )
+    server.set_bot_instance(
+        TradingEngine(
+            config,
+            MockDataProvider(),
+            broker,
+            SimpleMovingAverageStrategy(),
+            risk_manager,
+        )
+    )
+    try:
+        yield TestClient(server.app)
+    finally:
+        server._bot_instance = None
+
+
+class TestTradingViewWebhook:
+    """Test the /webhook/tradingview endpoint."""
+
+    def _body(self, **fields) -> bytes:
+        payload = {
+            "ticker": "AAPL",
+            "action": "buy",
+            "quantity": 10,
+            "price": 150,
+            "timestamp": datetime.utcnow().isoformat(),
+            **fields,
+        }
+        # Deliberately not key-sorted, with ints the model coerces to floats:
+        # the signature must cover these exact bytes
+        return orjson.dumps(payload)
+
+    def _sign(self, body: bytes) -> str:
+        return hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+    def test_signed_webhook_is_accepted(self, client):
+        """Test that a signature over the raw body is verified end to end."""
+        body = self._body()
+        response = client.post(
+            "/webhook/tradingview",
+            content=body,
+            headers={"Content-Type": "application/json", "X-Signature": self._sign(body)},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "success"
+        assert response.json()["symbol"] == "AAPL"
+
+    def test_unsigned_webhook_checks_payload_secret(self, client):
+        """Test secret-in-payload webhooks, which TradingView alerts send."""
+        headers = {"Content-Type": "application/json"}
+        accepted = client.post(
+            "/webhook/tradingview",
+            content=self._body(secret=WEBHOOK_SECRET),
+            headers=headers,
+        )
+        rejected = client.post(
+            "/webhook/tradingview",
+            content=self._body(secret="wrong_secret"),
+            headers=headers,
+        )
+
+        assert accepted.status_code == 200
+        assert rejected.status_code == 500
+
+    def test_bad_signature_is_rejected(self, client):
+        """Test that a signature over different bytes is rejected."""
+        body = self._body()
+        response = client.post(
+            "/webhook/tradingview",
+            content=body,
+            headers={
+                "Content-Type": "application/json",
+                "X-Signature": self._sign(body + b" "),
+            },
+        )
+
+        assert response.status_code == 500
+        assert "signature" in response.json()["detail"]
+
+    def test_invalid_payload_is_rejected(self, client):
+        """Test that a body missing required fields fails validation."""
+        response = client.post(
+            "/webhook/tradingview",
+            content=orjson.dumps({"ticker": "AAPL"}),
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == 422
+
+
+class TestHealth:
+    """Test the /health endpoint."""
+
+    def test_timestamp_is_current_without_lifespan(self):
+        """Test that each probe is stamped when it is served."""
+        client = TestClient(server.app)
+        before = datetime.utcnow()
+        first = client.get("/health").json()
+        second = client.get("/health").json()
+
+        assert first["status"] == "healthy"
+        assert datetime.fromisoformat(first["timestamp"]) >= before
+        assert datetime.fromisoformat(second["timestamp"]) >= datetime.fromisoformat(
+            first["timestamp"]
+        )
+
+    def test_timestamps_use_order_isoformat(self):
+        """Test that encoded datetimes match the naive isoformat of orders."""
+        now = datetime.utcnow()
+        assert orjson.loads(server._dumps({"timestamp": now})) == {
+            "timestamp": now.isoformat()
+        }
+
+
+class TestRestEndpoints:
+    """Test the REST endpoints served through ORJSONResponse."""
+
+    def _add_open_orders(self, paper_broker, count):
+        for i in range(count):
+            paper_broker._order_manager.add_order(
+                Order(
+                    id=f"order-{i}",
+                    symbol="AAPL",
+                    side=OrderSide.BUY,
+                    quantity=1,
+                    order_type=OrderType.LIMIT,
+                    price=100.0,
+                )
+            )
+
+    def test_status_and_account(self, client):
+        """Test that model and dict responses both render as JSON."""
+        status = client.get("/api/status")
+        account = client.get("/api/account")
+
+        assert status.status_code == 200
+        assert status.headers["content-type"] == "application/json"
+        assert status.json()["symbols"] == ["AAPL"]
+        assert account.json()["cash"] == 100000
+
+    def test_positions_after_webhook(self, client):
+        """Test that a filled webhook order shows up as a position."""
+        client.post(
+            "/webhook/tradingview",
+            content=orjson.dumps(
+                {"ticker": "AAPL", "action": "buy", "quantity": 10, "price": 150}
+            ),
+            headers={"Content-Type": "application/json"},
+        )
+        positions = client.get("/api/positions").json()
+
+        assert [p["symbol"] for p in positions] == ["AAPL"]
+        assert positions[0]["quantity"] == 10
+        assert positions[0]["current_price"] == 150.0
+
+    def test_orders_limit(self, client, paper_broker):
+        """Test that limit keeps the newest orders, and 0 keeps them all."""
+        self._add_open_orders(paper_broker, 3)
+
+        newest = client.get("/api/orders", params={"limit": 2}).json()
+        everything = client.get("/api/orders", params={"limit": 0})
+
+        assert [o["id"] for o in newest] == ["order-1", "order-2"]
+        assert everything.status_code == 200
+        assert len(everything.json()) == 3
+        assert client.get("/api/orders", params={"status": "filled"}).json() == []
+
+
+class TestDashboard:
+    """Test the precompressed dashboard."""
+
+    def _get(self, accept_encoding):
+        return TestClient(server.app).get(
+            "/", headers={"Accept-Encoding": accept_encoding}
+        )
+
+    def test_serves_gzip_when_accepted(self):
+        """Test that gzip-capable clients get the precompressed copy."""
+        for header in ("gzip", "br, gzip;q=0.5", "*"):
+            response = self._get(header)
+            assert response.headers.get("content-encoding") == "gzip", header
+            assert response.content == server._DASHBOARD_HTML
+
+    def test_honours_refused_gzip(self):
+        """Test that q=0 and absent codings get the plain copy."""
+        for header in ("identity", "gzip;q=0", "br", "*;q=0", "gzip;q=0, *"):
+            response = self._get(header)
+            assert "content-encoding" not in response.headers, header
+            assert response.content == server._DASHBOARD_HTML
+
+    def test_precompressed_copy_matches(self):
+        """Test that the startup copy decompresses to the template."""
+        assert gzip.decompress(server._DASHBOARD_GZIP) == server._DASHBOARD_HTML
+
+
+class _FakeWebSocket:
+    """Records the frames a ConnectionManager writer sends."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+class TestConnectionManager:
+    """Test the per-client websocket queues."""
+
+    @pytest.mark.asyncio
+    async def test_bursts_are_merged_into_one_frame(self):
+        """Test that messages queued before the writer runs go out together."""
+        manager = server.ConnectionManager()
+        websocket = _FakeWebSocket()
+        await manager.connect(websocket)
+
+        for i in range(3):
+            await manager.broadcast({"type": "tick", "seq": i})
+        await asyncio.sleep(0)
+        await manager.send(websocket, {"type": "single"})
+        await asyncio.sleep(0)
+        manager.disconnect(websocket)
+
+        assert [orjson.loads(frame) for frame in websocket.sent] == [
+            [{"type": "tick", "seq": i} for i in range(3)],
+            {"type": "single"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_slow_client_drops_oldest(self, monkeypatch):
+        """Test that a full queue drops the oldest message."""
+        monkeypatch.setattr(server, "OUTBOUND_QUEUE_SIZE", 2)
+        manager = server.ConnectionManager()
+        websocket = _FakeWebSocket()
+        await manager.connect(websocket)
+
+        for i in range(3):
+            await manager.broadcast({"seq": i})
+        await asyncio.sleep(0)
+        manager.disconnect(websocket)
+
+        assert orjson.loads(websocket.sent[0]) == [{"seq": 1}, {"seq": 2}]
+
+
+class _CountingBroker:
+    """Broker stand-in counting get_positions calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_positions(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {}
+
+
+class TestPositionsCache:
+    """Test the short-lived shared positions cache."""
+
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        server._positions_cache.update(ts=0.0, value=None, inflight=None)
+        yield
+        server._positions_cache.update(ts=0.0, value=None, inflight=None)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self):
+        """Test that callers within the TTL share one broker request."""
+        bot = SimpleNamespace(broker=_CountingBroker())
+
+        await asyncio.gather(*(server.get_positions_cached(bot) for _ in range(3)))
+        await server.get_positions_cached(bot)
+        assert bot.broker.calls == 1
+
+        await server.get_positions_cached(bot, ttl=0.0)
+        assert bot.broker.calls == 2
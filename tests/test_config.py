@@ -0,0 +1,153 @@
+"""Tests for configuration loading and environment overrides."""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bot.config import Config, _parse_env_value, load_config, mask_secrets
+
+
+class ParseEnvValueTestCase(unittest.TestCase):
+    """Unit tests for environment value coercion."""
+
+    def test_parses_numbers(self) -> None:
+        self.assertEqual(_parse_env_value("42"), 42)
+        self.assertEqual(_parse_env_value("-7"), -7)
+        self.assertEqual(_parse_env_value("0.25"), 0.25)
+        self.assertEqual(_parse_env_value("1.5e3"), 1500.0)
+        self.assertEqual(_parse_env_value(".5"), 0.5)
+        self.assertEqual(_parse_env_value("+3"), 3)
+        self.assertIsInstance(_parse_env_value("10.0"), float)
+
+    def test_parses_numbers_the_way_int_and_float_do(self) -> None:
+        self.assertEqual(_parse_env_value("42 "), 42)
+        self.assertEqual(_parse_env_value("1.0 "), 1.0)
+        self.assertEqual(_parse_env_value("1_000"), 1000)
+        self.assertEqual(_parse_env_value(" 42"), 42)
+        self.assertEqual(_parse_env_value("\u0661\u0662"), 12)
+
+    def test_parses_booleans_and_json(self) -> None:
+        self.assertIs(_parse_env_value("TRUE"), True)
+        self.assertIs(_parse_env_value("false"), False)
+        self.assertEqual(_parse_env_value('["AAPL", "MSFT"]'), ["AAPL", "MSFT"])
+
+    def test_leaves_plain_strings_alone(self) -> None:
+        for value in ("AAPL", "1m", "1.2.3", "paper", "4h", "", "-", "\u00b2"):
+            self.assertEqual(_parse_env_value(value), value)
+
+
+class EnvOverrideTestCase(unittest.TestCase):
+    """Environment variables should override nested config values."""
+
+    def test_env_overrides_nested_values(self) -> None:
+        env = {
+            "TRADING_BOT__ENGINE__MODE": "paper",
+            "TRADING_BOT__ENGINE__BROKER__STARTING_CASH": "50000.0",
+            "UNRELATED": "ignored",
+        }
+        with mock.patch.dict(os.environ, env):
+            config = load_config()
+
+        self.assertEqual(config.engine.mode, "paper")
+        self.assertEqual(config.engine.broker.starting_cash, 50_000.0)
+
+
+class LoadConfigFileTestCase(unittest.TestCase):
+    """Config files are re-read when they change on disk."""
+
+    def test_reloads_modified_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "config.json"
+            path.write_text('{"engine": {"mode": "paper"}}', encoding="utf-8")
+            first = load_config(path)
+            first.engine.mode = "live"
+
+            self.assertEqual(load_config(path).engine.mode, "paper")
+
+            path.write_text(
+                '{"engine": {"mode": "backtest", "timeframe": "5m"}}', encoding="utf-8"
+            )
+            os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+            reloaded = load_config(path)
+
+        self.assertEqual(reloaded.engine.mode, "backtest")
+        self.assertEqual(reloaded.engine.timeframe, "5m")
+
+    def test_interns_symbols(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "config.json"
+            path.write_text(
+                '{"engine": {"symbols": ["AAPL", "MSFT"]}}', encoding="utf-8"
+            )
+            config = load_config(path)
+
+        self.assertEqual(config.engine.symbols, ["AAPL", "MSFT"])
+        self.assertIs(config.engine.symbols[1], sys.intern("MSFT"))
+
+    def test_discovers_default_file_in_cwd(self) -> None:
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "config.json").write_text(
+                '{"engine": {"timeframe": "15m"}}', encoding="utf-8"
+            )
+            os.chdir(tmp)
+            try:
+                config = load_config()
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(config.engine.timeframe, "15m")
+
+
+class ParamsTestCase(unittest.TestCase):
+    """Each config section owns a plain params dict."""
+
+    def test_default_params_are_independent_dicts(self) -> None:
+        first, second = Config(), Config()
+        first.engine.broker.params["api_key"] = "abc"
+
+        self.assertEqual(second.engine.broker.params, {})
+        self.assertIs(type(Config().engine.strategy.params), dict)
+
+    def test_config_round_trips_through_copy_and_pickle(self) -> None:
+        config = Config()
+        config.engine.strategy.params["short_window"] = 5
+
+        self.assertEqual(copy.deepcopy(config), config)
+        self.assertEqual(pickle.loads(pickle.dumps(config)), config)
+        self.assertEqual(
+            dataclasses.asdict(config)["engine"]["strategy"]["params"],
+            {"short_window": 5},
+        )
+
+
+class MaskSecretsTestCase(unittest.TestCase):
+    """Secrets should be masked at any depth of the config tree."""
+
+    def test_masks_secret_keys(self) -> None:
+        config = Config()
+        config.engine.broker.params = {
+            "API_KEY": "abc",
+            "auth": {"refresh_token": "xyz", "region": "us"},
+        }
+
+        masked = mask_secrets(config)
+        params = masked["engine"]["broker"]["params"]
+
+        self.assertEqual(params["API_KEY"], "***")
+        self.assertEqual(params["auth"], {"refresh_token": "***", "region": "us"})
+        self.assertEqual(masked["engine"]["symbols"], ["AAPL"])
+        self.assertIsNot(masked["engine"]["symbols"], config.engine.symbols)
+        self.assertEqual(masked["engine"]["broker"]["starting_cash"], 100_000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
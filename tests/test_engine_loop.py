@@ -9,36 +9,79 @@ import pytest
 from bot.brokers.paper import PaperBroker
 from bot.config import Config
 from bot.data_providers.mock import MockDataProvider
-from bot.engine.loop import TradingEngine
+from bot.engine.factory import build_components
+from bot.engine.loop import TradingEngine, install_uvloop
 from bot.risk.basic import BasicRiskConfig, BasicRiskManager
+from bot.risk.enhanced import EnhancedRiskManager
 from bot.strategies.example_sma import (
     SimpleMovingAverageConfig,
     SimpleMovingAverageStrategy,
 )
 
 
-class EngineLoopTest(unittest.TestCase):
-    @pytest.mark.asyncio
-    async def test_backtest_runs_without_errors(self) -> None:
-        """Test that the trading engine runs a backtest without errors."""
+@pytest.mark.asyncio
+async def test_backtest_runs_without_errors() -> None:
+    """Test that the trading engine runs a backtest without errors."""
+    config = Config()
+    config.engine.symbols = ["AAPL"]
+    config.engine.mode = "backtest"
+    data_provider = MockDataProvider()
+    broker = PaperBroker(
+        starting_cash=config.engine.broker.starting_cash, simulate_latency=False
+    )
+    strategy = SimpleMovingAverageStrategy(
+        SimpleMovingAverageConfig(short_window=2, long_window=3, trade_quantity=1)
+    )
+    risk_cfg = BasicRiskConfig(
+        max_position_size=config.engine.risk.max_position_size,
+        max_daily_loss=config.engine.risk.max_daily_loss,
+        starting_cash=config.engine.broker.starting_cash,
+    )
+    risk_manager = BasicRiskManager(risk_cfg)
+    engine = TradingEngine(config, data_provider, broker, strategy, risk_manager)
+    # Bound the run so a regression can't hang the suite
+    await asyncio.wait_for(engine.run(), timeout=30.0)
+
+    assert not engine.circuit_breaker_tripped
+    assert len(engine.backtest_history["AAPL"]) > 0
+
+
+class InstallUvloopTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        asyncio.set_event_loop_policy(None)
+
+    def test_installs_uvloop_policy_when_available(self) -> None:
+        uvloop = pytest.importorskip("uvloop")
+        self.assertTrue(install_uvloop())
+        self.assertIsInstance(
+            asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy
+        )
+
+
+class BuildComponentsTest(unittest.TestCase):
+    def test_builds_fresh_components_per_call(self) -> None:
+        config = Config()
+        first = build_components(config)
+        second = build_components(config)
+        self.assertIsInstance(first[3], BasicRiskManager)
+        for a, b in zip(first, second):
+            self.assertIsNot(a, b)
+
+    def test_backtest_broker_skips_simulated_latency(self) -> None:
         config = Config()
-        config.engine.symbols = ["AAPL"]
         config.engine.mode = "backtest"
-        data_provider = MockDataProvider()
-        broker = PaperBroker(starting_cash=config.engine.broker.starting_cash)
-        strategy = SimpleMovingAverageStrategy(
-            SimpleMovingAverageConfig(short_window=2, long_window=3, trade_quantity=1)
-        )
-        risk_cfg = BasicRiskConfig(
-            max_position_size=config.engine.risk.max_position_size,
-            max_daily_loss=config.engine.risk.max_daily_loss,
-            starting_cash=config.engine.broker.starting_cash,
+        _, broker, _, _ = build_components(config)
+        self.assertFalse(broker._simulate_latency)
+
+        config.engine.mode = "paper"
+        _, broker, _, _ = build_components(config)
+        self.assertTrue(broker._simulate_latency)
+
+    def test_enhanced_risk_uses_config_limits(self) -> None:
+        config = Config()
+        *_, risk_manager = build_components(config, risk="enhanced")
+        self.assertIsInstance(risk_manager, EnhancedRiskManager)
+        self.assertEqual(
+            risk_manager.config.max_open_positions,
+            config.engine.risk.max_open_positions,
         )
-        risk_manager = BasicRiskManager(risk_cfg)
-        engine = TradingEngine(config, data_provider, broker, strategy, risk_manager)
-        # Run with a short timeout to avoid hanging tests
-        try:
-            await asyncio.wait_for(engine.run(), timeout=5.0)
-        except asyncio.TimeoutError:
-            # It's okay if we timeout - the engine was working, just slow
-            pass
@@ -5,7 +5,18 @@ from __future__ import annotations
 import unittest
 from datetime import datetime
 
-from bot.models import Order, OrderFill, OrderSide, OrderStatus, OrderType, Position
+from bot.models import (
+    Candle,
+    CandleRing,
+    MarketState,
+    Order,
+    OrderFill,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    PortfolioState,
+    Position,
+)
 from bot.config import BrokerConfig, ConfigValidationError, EngineConfig
 
 
@@ -21,6 +32,7 @@ class TestOrderLifecycle(unittest.TestCase):
             quantity=100.0,
             order_type=OrderType.MARKET,
         )
+        self.assertIsNone(order.average_fill_price)
 
         # Add first fill
         fill1 = OrderFill(
@@ -125,6 +137,27 @@ class TestPositionManagement(unittest.TestCase):
         self.assertEqual(position.avg_price, 0.0)
         self.assertTrue(position.is_flat)
 
+    def test_position_close_snaps_residual_to_zero(self):
+        """Test that float residuals on close leave an exactly flat position."""
+        position = Position(symbol="AAPL", quantity=0.0, avg_price=0.0)
+        for _ in range(3):
+            position.update(0.1, 10.0)
+        self.assertNotEqual(position.quantity, 0.3)
+
+        position.update(-0.3, 11.0)
+
+        self.assertEqual(position.quantity, 0.0)
+        self.assertEqual(position.avg_price, 0.0)
+        self.assertTrue(position.is_flat)
+
+    def test_position_with_float_residual_is_flat(self):
+        """Test that a residual quantity not produced by update() is flat."""
+        position = Position(symbol="AAPL", quantity=0.1 + 0.2 - 0.3, avg_price=10.0)
+
+        self.assertNotEqual(position.quantity, 0.0)
+        self.assertTrue(position.is_flat)
+        self.assertEqual(position.unrealized_pnl(12.0), 0.0)
+
     def test_position_reversal(self):
         """Test reversing a position (long to short)."""
         position = Position(symbol="AAPL", quantity=100.0, avg_price=150.0)
@@ -138,6 +171,134 @@ class TestPositionManagement(unittest.TestCase):
         )  # New avg price for reversed position
         self.assertTrue(position.is_short)
 
+    def test_portfolio_exposures(self):
+        """Test long/short/net exposure aggregation."""
+        portfolio = PortfolioState(cash=10_000.0)
+        portfolio.positions["AAPL"] = Position("AAPL", 10.0, 150.0)
+        portfolio.positions["MSFT"] = Position("MSFT", -5.0, 300.0)
+        portfolio.positions["TSLA"] = Position("TSLA", 0.0, 0.0)
+
+        self.assertEqual(portfolio.exposure_totals(), (1500.0, 1500.0))
+        self.assertEqual(portfolio.long_exposure, 1500.0)
+        self.assertEqual(portfolio.short_exposure, 1500.0)
+        self.assertEqual(portfolio.net_exposure, 3000.0)
+
+    def test_portfolio_unrealized_pnl_and_equity(self):
+        """Test P&L aggregation skips unpriced symbols."""
+        portfolio = PortfolioState(cash=1_000.0)
+        portfolio.positions["AAPL"] = Position("AAPL", 10.0, 150.0)
+        portfolio.positions["MSFT"] = Position("MSFT", -5.0, 300.0)
+        portfolio.positions["TSLA"] = Position("TSLA", 0.0, 0.0)
+        prices = {"AAPL": 155.0, "MSFT": 290.0, "TSLA": 200.0}
+
+        self.assertEqual(portfolio.total_unrealized_pnl(prices), 100.0)
+        self.assertEqual(portfolio.total_unrealized_pnl({"AAPL": 140.0}), -100.0)
+        self.assertEqual(portfolio.equity(prices), 1_100.0)
+
+    def test_portfolio_exposure_cache_invalidation(self):
+        """Test cached exposures refresh on reassignment or invalidate()."""
+        portfolio = PortfolioState(cash=10_000.0)
+        portfolio.positions["AAPL"] = Position("AAPL", 10.0, 150.0)
+        self.assertEqual(portfolio.net_exposure, 1500.0)
+
+        portfolio.positions["AAPL"].update(10.0, 150.0)
+        self.assertEqual(portfolio.net_exposure, 1500.0)
+        portfolio.invalidate()
+        self.assertEqual(portfolio.net_exposure, 3000.0)
+
+        portfolio.positions = {"MSFT": Position("MSFT", -1.0, 300.0)}
+        self.assertEqual(portfolio.exposure_totals(), (0.0, 300.0))
+
+
+class TestCandleValidation(unittest.TestCase):
+    """Test candle integrity checks."""
+
+    def test_rejects_inconsistent_candles(self):
+        """Test that high/low outside open/close and negative volume fail."""
+        now = datetime.utcnow()
+        with self.assertRaises(ValueError):
+            Candle("AAPL", now, 100.0, 99.0, 98.0, 98.5, 1.0)  # high < open
+        with self.assertRaises(ValueError):
+            Candle("AAPL", now, 100.0, 102.0, 100.5, 101.0, 1.0)  # low > open
+        with self.assertRaises(ValueError):
+            Candle("AAPL", now, 100.0, 102.0, 99.0, 101.0, -1.0)  # volume < 0
+
+    def test_unchecked_matches_constructor(self):
+        """Test that the unvalidated builder produces an equal candle."""
+        now = datetime.utcnow()
+        args = ("AAPL", now, 100.0, 102.0, 99.0, 101.0, 5.0)
+        self.assertEqual(Candle.unchecked(*args), Candle(*args))
+
+
+class TestCandleRing(unittest.TestCase):
+    """Test the fixed-capacity candle history."""
+
+    @staticmethod
+    def _candle(price: float) -> Candle:
+        return Candle(
+            symbol="AAPL",
+            timestamp=datetime(2024, 1, 1),
+            open=price,
+            high=price + 1,
+            low=price - 1,
+            close=price + 0.5,
+            volume=10.0,
+        )
+
+    def test_sequence_access_before_wrap(self):
+        """Test indexing, slicing and columns while below capacity."""
+        ring = CandleRing(capacity=5)
+        for price in (100.0, 101.0, 102.0):
+            ring.append(self._candle(price))
+
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring[0].open, 100.0)
+        self.assertEqual(ring[-1].open, 102.0)
+        self.assertEqual([c.open for c in ring[-2:]], [101.0, 102.0])
+        self.assertEqual(ring.close.tolist(), [100.5, 101.5, 102.5])
+
+    def test_wraps_oldest_first(self):
+        """Test that appends past capacity drop the oldest candles in order."""
+        ring = CandleRing(capacity=3)
+        for price in range(100, 105):
+            ring.append(self._candle(float(price)))
+
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([c.open for c in ring], [102.0, 103.0, 104.0])
+        self.assertEqual(ring.open.tolist(), [102.0, 103.0, 104.0])
+        self.assertEqual(ring.high.tolist(), [103.0, 104.0, 105.0])
+        self.assertEqual(ring[-1].open, 104.0)
+        with self.assertRaises(IndexError):
+            ring[3]
+
+    def test_slices_match_list_slices(self):
+        """Test that slicing follows list semantics before and after wrapping."""
+        ring = CandleRing(capacity=5)
+        for count in range(8):
+            expected = [c.open for c in ring]
+            for window in (
+                slice(None),
+                slice(-3, None),
+                slice(1, 4),
+                slice(4, 1),
+                slice(None, None, 2),
+                slice(None, None, -1),
+            ):
+                self.assertEqual([c.open for c in ring[window]], expected[window])
+            ring.append(self._candle(100.0 + count))
+
+    def test_market_state_snapshot_is_detached(self):
+        """Test that snapshots don't change when the ring keeps advancing."""
+        ring = CandleRing(capacity=2)
+        ring.append(self._candle(100.0))
+        market_state = MarketState(candles={"AAPL": ring})
+
+        snapshot = market_state.snapshot("AAPL")
+        ring.append(self._candle(101.0))
+
+        self.assertEqual([c.open for c in snapshot], [100.0])
+        self.assertEqual(market_state.snapshot("MSFT"), ())
+
 
 class TestConfigValidation(unittest.TestCase):
     """Test configuration validation."""
@@ -0,0 +1,76 @@
+"""Tests for the mock data provider's synthetic history and price stream."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta
+
+from bot.data_providers.mock import MockDataProvider
+
+
+class MockHistoricalDataTestCase(unittest.TestCase):
+    """Generated candles should be deterministic and internally consistent."""
+
+    def setUp(self) -> None:
+        self.start = datetime(2024, 1, 1, 9, 30)
+        self.end = self.start + timedelta(minutes=999)
+
+    def test_is_deterministic_per_seed(self) -> None:
+        first = MockDataProvider(seed=7).get_historical_data(
+            "AAPL", self.start, self.end, "1m"
+        )
+        second = MockDataProvider(seed=7).get_historical_data(
+            "AAPL", self.start, self.end, "1m"
+        )
+
+        self.assertEqual(len(first), 1_000)
+        self.assertEqual(first, second)
+
+    def test_candles_chain_and_respect_price_floor(self) -> None:
+        provider = MockDataProvider(seed=1, base_price=2.0)
+        candles = provider.get_historical_data("AAPL", self.start, self.end, "1m")
+
+        self.assertEqual(candles[0].open, 2.0)
+        self.assertEqual(candles[-1].timestamp, self.end)
+        for previous, candle in zip(candles, candles[1:]):
+            self.assertEqual(candle.open, previous.close)
+            self.assertEqual(candle.timestamp - previous.timestamp, timedelta(minutes=1))
+        for candle in candles:
+            self.assertIsInstance(candle.close, float)
+            self.assertGreaterEqual(candle.close, 1.0)
+            self.assertGreaterEqual(candle.high, max(candle.open, candle.close))
+            self.assertLessEqual(candle.low, min(candle.open, candle.close))
+            self.assertLessEqual(abs(candle.close - candle.open), 1.0)
+
+    def test_empty_range(self) -> None:
+        provider = MockDataProvider()
+        self.assertEqual(
+            provider.get_historical_data("AAPL", self.end, self.start, "1m"), []
+        )
+
+
+class MockStreamPricesTestCase(unittest.IsolatedAsyncioTestCase):
+    """Streamed tick batches cover every symbol with a shared timestamp."""
+
+    async def test_yields_one_tick_per_symbol(self) -> None:
+        provider = MockDataProvider(seed=3)
+        await provider.connect()
+
+        stream = provider.stream_prices(["AAPL", "MSFT", "AAPL"])
+        batch = await anext(stream)
+        await stream.aclose()
+
+        self.assertEqual(list(batch), ["AAPL", "MSFT"])
+        self.assertEqual(len({tick.timestamp for tick in batch.values()}), 1)
+        for symbol, tick in batch.items():
+            self.assertEqual(tick.symbol, symbol)
+            self.assertIsInstance(tick.price, float)
+            self.assertLessEqual(abs(tick.price - 100.0), 0.5)
+
+    async def test_requires_connect(self) -> None:
+        with self.assertRaises(RuntimeError):
+            await anext(MockDataProvider().stream_prices(["AAPL"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Tests for the broker order lifecycle tracker."""
+
+from __future__ import annotations
+
+import unittest
+
+from bot.brokers.base import OrderManager
+from bot.models import Order, OrderSide, OrderStatus
+
+
+def _order(order_id: str, symbol: str = "AAPL") -> Order:
+    return Order(id=order_id, symbol=symbol, side=OrderSide.BUY, quantity=1.0)
+
+
+class OrderManagerTest(unittest.TestCase):
+    """Open-order queries should only return non-terminal orders."""
+
+    def setUp(self) -> None:
+        self.manager = OrderManager()
+
+    def test_open_orders_keep_insertion_order(self) -> None:
+        for order_id in ("1", "2", "3"):
+            self.manager.add_order(_order(order_id))
+
+        self.assertEqual(
+            [o.id for o in self.manager.get_open_orders()], ["1", "2", "3"]
+        )
+
+    def test_completed_orders_leave_open_indices(self) -> None:
+        order = _order("1")
+        self.manager.add_order(order)
+        self.manager.add_order(_order("2", symbol="MSFT"))
+
+        order.status = OrderStatus.FILLED
+        self.manager.update_order(order)
+
+        self.assertEqual([o.id for o in self.manager.get_open_orders()], ["2"])
+        self.assertEqual(self.manager.get_pending_orders_for_symbol("AAPL"), [])
+        self.assertEqual(
+            [o.id for o in self.manager.get_pending_orders_for_symbol("MSFT")],
+            ["2"],
+        )
+
+    def test_in_place_status_change_without_update(self) -> None:
+        order = _order("1")
+        self.manager.add_order(order)
+
+        order.status = OrderStatus.REJECTED
+
+        self.assertEqual(self.manager.get_open_orders(), [])
+        self.assertIs(self.manager.get_order("1"), order)
+
+    def test_remove_order_clears_indices(self) -> None:
+        order = _order("1")
+        order.broker_order_id = "B1"
+        self.manager.add_order(order)
+
+        self.manager.remove_order("B1")
+
+        self.assertIsNone(self.manager.get_order("1"))
+        self.assertEqual(self.manager.get_open_orders(), [])
+        self.assertEqual(self.manager.get_pending_orders_for_symbol("AAPL"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Tests for the paper trading broker."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from bot.brokers.paper import PaperBroker
+from bot.models import Order, OrderSide, OrderType
+
+
+def _market_order(order_id: str, side: OrderSide, quantity: float) -> Order:
+    return Order(
+        id=order_id,
+        symbol="AAPL",
+        side=side,
+        quantity=quantity,
+        order_type=OrderType.MARKET,
+    )
+
+
+class TestPaperBroker:
+    """Test paper broker bookkeeping."""
+
+    @pytest.fixture
+    def broker(self):
+        """Create a priced broker without simulated latency."""
+        broker = PaperBroker(starting_cash=100000, simulate_latency=False)
+        broker.update_market_prices({"AAPL": 100.0})
+        return broker
+
+    @pytest.mark.asyncio
+    async def test_order_ids_are_sequential_per_account(self, broker):
+        """Test that broker order ids share the account key and count up."""
+        await broker.connect()
+        first = await broker.submit_order(_market_order("o1", OrderSide.BUY, 1))
+        second = await broker.submit_order(_market_order("o2", OrderSide.BUY, 1))
+
+        prefix = first.broker_order_id[:-8]
+        assert prefix.startswith("PAPER_")
+        assert second.broker_order_id == f"{prefix}{2:08X}"
+
+    @pytest.mark.asyncio
+    async def test_positions_shared_until_next_fill(self, broker):
+        """Test that get_positions reuses a read-only mapping until a fill."""
+        await broker.connect()
+        await broker.submit_order(_market_order("o1", OrderSide.BUY, 10))
+        positions = await broker.get_positions()
+        assert await broker.get_positions() is positions
+        assert positions["AAPL"].quantity == 10
+        with pytest.raises(TypeError):
+            positions["MSFT"] = positions["AAPL"]
+
+        await broker.submit_order(_market_order("o2", OrderSide.SELL, 10))
+        after_close = await broker.get_positions()
+        assert after_close is not positions
+        assert after_close == {}
+
+    @pytest.mark.asyncio
+    async def test_fills_use_injected_clock(self):
+        """Test that fills are stamped from the broker's clock."""
+        bar_time = datetime(2024, 1, 2, 15, 30)
+        broker = PaperBroker(
+            starting_cash=100000,
+            simulate_latency=False,
+            simulate_partial_fills=True,
+            clock=lambda: bar_time,
+        )
+        await broker.connect()
+        broker.update_market_prices({"AAPL": 100.0})
+
+        order = await broker.submit_order(_market_order("o1", OrderSide.BUY, 150))
+
+        assert len(order.fills) > 1
+        assert all(fill.timestamp == bar_time for fill in order.fills)
+        assert (await broker.get_account()).timestamp == bar_time
+
+    @pytest.mark.asyncio
+    async def test_liquidate_all_positions_flattens_book(self, broker):
+        """Test that liquidation closes long and short positions."""
+        await broker.connect()
+        broker.update_market_prices({"AAPL": 100.0, "MSFT": 200.0})
+        await broker.submit_order(_market_order("o1", OrderSide.BUY, 10))
+        await broker.submit_order(
+            Order(
+                id="o2",
+                symbol="MSFT",
+                side=OrderSide.SELL_SHORT,
+                quantity=5,
+                order_type=OrderType.MARKET,
+            )
+        )
+
+        orders = await broker.liquidate_all_positions()
+
+        assert sorted((o.symbol, o.side) for o in orders) == [
+            ("AAPL", OrderSide.SELL),
+            ("MSFT", OrderSide.BUY_TO_COVER),
+        ]
+        assert await broker.get_positions() == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_covers_do_not_overdraw_cash(self):
+        """Test that in-flight orders hold their cost against the cash check."""
+        broker = PaperBroker(starting_cash=1500)
+        await broker.connect()
+        broker.update_market_prices({"AAPL": 100.0, "MSFT": 100.0})
+        for symbol in ("AAPL", "MSFT"):
+            await broker.submit_order(
+                Order(
+                    id=f"short-{symbol}",
+                    symbol=symbol,
+                    side=OrderSide.SELL_SHORT,
+                    quantity=8,
+                    order_type=OrderType.MARKET,
+                )
+            )
+        # Each cover now costs $2,000 against $3,100 of cash
+        broker.update_market_prices({"AAPL": 250.0, "MSFT": 250.0})
+
+        orders = await broker.liquidate_all_positions()
+
+        assert len(orders) == 1
+        assert await broker.get_balance() == pytest.approx(1100.0)
+        assert len(await broker.get_positions()) == 1
@@ -42,7 +42,13 @@ class BasicRiskManagerTestCase(unittest.TestCase):
             cash=self.config.starting_cash,
             positions={"AAPL": Position(symbol="AAPL", quantity=30.0, avg_price=100.0)},
         )
-        signal = Signal(symbol="AAPL", action=SignalAction.OPEN_LONG, quantity=40.0)
+        signal = Signal(
+            symbol="AAPL",
+            action=SignalAction.OPEN_LONG,
+            quantity=40.0,
+            confidence=0.5,
+            meta={"short_avg": 101.0},
+        )
 
         result = self.risk_manager.validate_signal(
             signal, portfolio_state, self.market_state
@@ -53,6 +59,10 @@ class BasicRiskManagerTestCase(unittest.TestCase):
         self.assertEqual(result.quantity, 20.0)
         self.assertIn("capped_quantity", result.meta)
         self.assertEqual(result.meta["capped_quantity"], 20.0)
+        self.assertEqual(result.meta["short_avg"], 101.0)
+        self.assertEqual(signal.meta, {"short_avg": 101.0})
+        self.assertEqual(result.confidence, 0.5)
+        self.assertEqual(result.timestamp, signal.timestamp)
 
     def test_allows_closing_signals_even_with_limit(self) -> None:
         """Exit orders should flow even if exposure limits are already met."""
@@ -33,6 +33,18 @@ class TestTradeActivity:
         count = activity.get_orders_in_last_minute(now)
         assert count == 2  # Only the last two
 
+    def test_old_orders_are_trimmed(self):
+        """Test that orders older than an hour are dropped from the window."""
+        activity = TradeActivity()
+        now = datetime.utcnow()
+        
+        activity.add_order(now - timedelta(minutes=90))
+        activity.add_order(now - timedelta(minutes=30))
+        activity.add_order(now)
+        
+        assert list(activity.order_timestamps) == [now - timedelta(minutes=30), now]
+        assert activity.get_orders_in_last_minute(now + timedelta(minutes=2)) == 0
+
     def test_add_day_trade(self):
         """Test recording day trades."""
         activity = TradeActivity()
@@ -43,6 +55,14 @@ class TestTradeActivity:
         
         assert activity.day_trades_count == 2
 
+    def test_last_entry_date_follows_timestamp(self):
+        """Test that the entry date is always derived from the timestamp."""
+        activity = TradeActivity()
+        assert activity.last_entry_date is None
+
+        activity.last_entry_timestamp = datetime(2024, 1, 2, 23, 59)
+        assert activity.last_entry_date == datetime(2024, 1, 2).date()
+
 
 class TestEnhancedRiskManager:
     """Test enhanced risk manager."""
@@ -168,6 +188,12 @@ class TestEnhancedRiskManager:
         assert result is None
         assert risk_manager.circuit_breaker_tripped is True
 
+    def test_drawdown_limit_boundary(self, risk_manager):
+        """Test that a drawdown of exactly the limit is rejected."""
+        # 20% default limit on $10k starting cash
+        assert risk_manager._check_drawdown_limit(8001.0)
+        assert not risk_manager._check_drawdown_limit(8000.0)
+
     def test_rate_limiting(self, risk_manager, portfolio_state, market_state):
         """Test rate limiting enforcement."""
         signal = Signal(
@@ -187,6 +213,44 @@ class TestEnhancedRiskManager:
         result = risk_manager.validate_signal(signal, portfolio_state, market_state)
         assert result is None
 
+    def test_global_rate_limit_counts_all_symbols(
+        self, risk_manager, portfolio_state, market_state
+    ):
+        """Test that the global limit counts orders across symbols."""
+        risk_manager.config.max_orders_per_minute = 2
+        risk_manager._record_order("MSFT")
+        risk_manager._record_order("GOOGL")
+        
+        signal = Signal(symbol="AAPL", action=SignalAction.OPEN_LONG, quantity=1)
+        now = datetime.utcnow()
+        assert not risk_manager._check_rate_limits(signal, now)
+        
+        # Entries older than a minute no longer count
+        risk_manager._global_order_times[0] -= timedelta(minutes=2)
+        assert risk_manager._check_rate_limits(signal, now)
+
+    def test_checks_do_not_create_activity(
+        self, risk_manager, portfolio_state, market_state
+    ):
+        """Test that checking a symbol does not register a tracker for it."""
+        signal = Signal(symbol="AAPL", action=SignalAction.OPEN_LONG, quantity=1)
+        assert risk_manager._check_rate_limits(signal, datetime.utcnow())
+        assert not risk_manager._would_be_day_trade(signal, datetime.utcnow().date())
+        assert "AAPL" not in risk_manager.activity
+
+        risk_manager._record_order("AAPL")
+        assert len(risk_manager.activity["AAPL"].order_timestamps) == 1
+
+    def test_same_day_close_is_day_trade(self, risk_manager):
+        """Test that closing on the entry date counts as a day trade."""
+        entry = datetime(2024, 1, 2, 15, 30)
+        risk_manager._record_order("AAPL", entry)
+        signal = Signal(symbol="AAPL", action=SignalAction.CLOSE_LONG, quantity=1)
+
+        assert risk_manager._would_be_day_trade(signal, entry.date())
+        next_day = (entry + timedelta(days=1)).date()
+        assert not risk_manager._would_be_day_trade(signal, next_day)
+
     def test_total_exposure_limit(self, risk_manager, portfolio_state, market_state):
         """Test total exposure limit."""
         # Add positions near exposure limit (max is 50k)
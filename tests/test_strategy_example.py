@@ -39,6 +39,7 @@ class SimpleSMATest(unittest.TestCase):
         signals = self.strategy.on_bar(market_state, self.portfolio)
         self.assertTrue(signals)
         self.assertEqual(SignalAction.OPEN_LONG, signals[0].action)
+        self.assertEqual(signals[0].timestamp, market_state.timestamp)
 
     def test_generates_close_long_signal(self):
         candles_open = self._build_candles([100, 105, 110])
@@ -54,6 +55,38 @@ class SimpleSMATest(unittest.TestCase):
         self.assertTrue(signals)
         self.assertEqual(SignalAction.CLOSE_LONG, signals[0].action)
 
+    def test_prepared_backtest_matches_incremental_signals(self):
+        prices = [100, 101, 99, 104, 108, 103, 97, 95, 102, 110, 111, 90]
+        candles = self._build_candles(prices)
+
+        def replay(strategy):
+            actions = []
+            for index in range(1, len(candles) + 1):
+                market_state = MarketState(candles={"AAPL": candles[:index]})
+                for signal in strategy.on_bar(market_state, self.portfolio):
+                    actions.append((index, signal.action))
+            return actions
+
+        prepared = SimpleMovingAverageStrategy(
+            SimpleMovingAverageConfig(short_window=2, long_window=3, trade_quantity=1)
+        )
+        prepared.prepare_backtest({"AAPL": candles})
+
+        expected = replay(self.strategy)
+        self.assertTrue(expected)
+        self.assertEqual(replay(prepared), expected)
+
+    def test_skips_symbols_without_a_new_bar(self):
+        candles = self._build_candles([100, 101, 105])
+        market_state = MarketState(
+            candles={"AAPL": candles}, updated_symbols=frozenset()
+        )
+        self.assertEqual(self.strategy.on_bar(market_state, self.portfolio), [])
+
+        market_state.updated_symbols = {"AAPL"}
+        signals = self.strategy.on_bar(market_state, self.portfolio)
+        self.assertEqual(SignalAction.OPEN_LONG, signals[0].action)
+
 
 if __name__ == "__main__":
     unittest.main()
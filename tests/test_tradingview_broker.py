@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import hmac
+
+import orjson
 import pytest
 from datetime import datetime
 
+from bot.brokers.base import BrokerError
 from bot.brokers.paper import PaperBroker
 from bot.brokers.tradingview import TradingViewBroker, TradingViewWebhookPayload
 from bot.models import Signal, SignalAction
@@ -83,6 +89,17 @@ class TestTradingViewWebhookPayload:
         assert signal.action == SignalAction.OPEN_SHORT
         assert signal.quantity == 10
 
+    def test_missing_timestamp_is_stamped_on_receipt(self):
+        """Test that an absent or null timestamp becomes the receipt time."""
+        for data in (
+            {"ticker": "AAPL", "action": "buy", "quantity": 1},
+            # The API model dumps unset optional fields as None
+            {"ticker": "AAPL", "action": "buy", "quantity": 1, "timestamp": None},
+        ):
+            before = datetime.utcnow()
+            signal = TradingViewWebhookPayload(data).to_signal()
+            assert before <= signal.timestamp <= datetime.utcnow()
+
 
 class TestTradingViewBroker:
     """Test TradingView broker integration."""
@@ -142,6 +159,23 @@ class TestTradingViewBroker:
         
         assert tv_broker.validate_webhook(payload) is False
 
+    def test_validate_webhook_hmac_signature(self, tv_broker):
+        """Test HMAC validation over the canonical JSON payload."""
+        payload = {"ticker": "AAPL", "action": "buy", "quantity": 10, "price": 150.0}
+        message = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        signature = hmac.new(b"test_secret", message, hashlib.sha256).hexdigest()
+
+        assert tv_broker.validate_webhook(payload, signature) is True
+        assert tv_broker.validate_webhook(payload, "0" * 64) is False
+
+    def test_validate_webhook_rejects_malformed_credentials(self, tv_broker):
+        """Test that non-string or non-ASCII credentials are rejected, not raised."""
+        payload = {"ticker": "AAPL", "action": "buy", "quantity": 10, "price": 150.0}
+
+        assert tv_broker.validate_webhook({**payload, "secret": 12345}) is False
+        assert tv_broker.validate_webhook({**payload, "secret": "sécret"}) is False
+        assert tv_broker.validate_webhook(payload, "é" * 64) is False
+
     def test_is_duplicate_signal(self, tv_broker):
         """Test duplicate signal detection."""
         signal = Signal(
@@ -157,6 +191,36 @@ class TestTradingViewBroker:
         # Second time should be duplicate
         assert tv_broker.is_duplicate_signal(signal) is True
 
+    def test_duplicate_signal_expires_after_ttl(self, tv_broker):
+        """Test that a signal is accepted again once its TTL has passed."""
+        signal = Signal(
+            symbol="AAPL",
+            action=SignalAction.OPEN_LONG,
+            quantity=10,
+            timestamp=datetime.utcnow(),
+        )
+
+        assert tv_broker.is_duplicate_signal(signal) is False
+        tv_broker._signal_ttl_seconds = 0
+        assert tv_broker.is_duplicate_signal(signal) is False
+
+    def test_seen_signals_are_bounded(self, tv_broker):
+        """Test that the dedup cache evicts the oldest entries at capacity."""
+        tv_broker._max_seen_signals = 3
+        now = datetime.utcnow()
+        signals = [
+            Signal(symbol="AAPL", action=SignalAction.OPEN_LONG, quantity=q, timestamp=now)
+            for q in range(1, 5)
+        ]
+
+        for signal in signals:
+            assert tv_broker.is_duplicate_signal(signal) is False
+
+        assert len(tv_broker._seen_signals) == 3
+        # The oldest fingerprint was evicted, the newest is still tracked
+        assert tv_broker.is_duplicate_signal(signals[-1]) is True
+        assert tv_broker.is_duplicate_signal(signals[0]) is False
+
     @pytest.mark.asyncio
     async def test_process_webhook(self, tv_broker):
         """Test processing a webhook."""
@@ -208,6 +272,101 @@ class TestTradingViewBroker:
         
         await tv_broker.close()
 
+    @pytest.mark.asyncio
+    async def test_process_webhook_bounds_concurrent_submissions(self, paper_broker):
+        """Test that concurrent webhooks share a bounded number of submit slots."""
+        tv_broker = TradingViewBroker(
+            execution_broker=paper_broker,
+            webhook_secret="test_secret",
+            webhook_concurrency=2,
+        )
+        await tv_broker.connect()
+        paper_broker.update_market_prices({"AAPL": 150.0})
+
+        in_flight = 0
+        peak = 0
+        submit = paper_broker.submit_order
+
+        async def slow_submit(order):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await submit(order)
+
+        paper_broker.submit_order = slow_submit
+        payloads = [
+            {"ticker": "AAPL", "action": "buy", "price": 150.0, "quantity": qty}
+            for qty in range(1, 7)
+        ]
+        orders = await asyncio.gather(*(tv_broker.process_webhook(p) for p in payloads))
+
+        assert all(order is not None for order in orders)
+        assert peak == 2
+
+        await tv_broker.close()
+
+    @pytest.mark.asyncio
+    async def test_reconcile_positions_delegates_after_lookups(self, tv_broker):
+        """Test that each symbol is looked up once before the broker reconciles."""
+        await tv_broker.connect()
+        paper_broker = tv_broker.execution_broker
+        paper_broker.update_market_prices({"AAPL": 150.0})
+        await tv_broker.process_webhook(
+            {"ticker": "AAPL", "action": "buy", "price": 150.0, "quantity": 10}
+        )
+
+        looked_up = []
+        reconciled = []
+        get_position = paper_broker.get_position
+        reconcile = paper_broker.reconcile_positions
+
+        async def recording_get_position(symbol):
+            looked_up.append(symbol)
+            return await get_position(symbol)
+
+        async def recording_reconcile(symbols):
+            # Runs only once every lookup has finished
+            reconciled.append((list(symbols), sorted(looked_up)))
+            return await reconcile(symbols)
+
+        paper_broker.get_position = recording_get_position
+        paper_broker.reconcile_positions = recording_reconcile
+        positions = await tv_broker.reconcile_positions(["AAPL", "MSFT", "AAPL"])
+
+        assert reconciled == [(["AAPL", "MSFT"], ["AAPL", "MSFT"])]
+        assert list(positions) == ["AAPL"]
+        assert positions["AAPL"].quantity == 10
+
+        await tv_broker.close()
+
+    @pytest.mark.asyncio
+    async def test_reconcile_positions_raises_on_failed_lookup(self, tv_broker):
+        """Test that a failed lookup raises instead of syncing a partial view."""
+        await tv_broker.connect()
+        paper_broker = tv_broker.execution_broker
+        reconciled = []
+        get_position = paper_broker.get_position
+
+        async def flaky_get_position(symbol):
+            if symbol == "TSLA":
+                raise RuntimeError("lookup failed")
+            return await get_position(symbol)
+
+        async def recording_reconcile(symbols):
+            reconciled.append(list(symbols))
+            return {}
+
+        paper_broker.get_position = flaky_get_position
+        paper_broker.reconcile_positions = recording_reconcile
+
+        with pytest.raises(BrokerError, match="TSLA"):
+            await tv_broker.reconcile_positions(["AAPL", "TSLA"])
+        assert reconciled == []
+
+        await tv_broker.close()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])